@@ -1,26 +1,153 @@
 # app/core/cache.py
 
+import asyncio
 import json
 import logging
-from typing import Optional, Any
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import (
+    Optional,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Tuple,
+)
 import redis.asyncio as redis
 from app.core.config import settings
+from app.core.cache_codecs import (
+    compress_value,
+    decode_value,
+    decompress_value,
+    encode_value,
+    get_codec,
+    get_compressor,
+    is_compressed,
+)
+from app.core.observability import (
+    InstrumentedRedis,
+    cache_namespace,
+    record_cache_lookup,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Delete the lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Marks values stored with a soft expiry for stale-while-revalidate
+STALE_ENVELOPE_KEY = "__swr__"
+
+# Keys per DEL command in delete_many; keeps single commands small
+DELETE_BATCH_SIZE = 500
+
+# Every cached view of the question bank, public and admin
+QUESTIONS_NAMESPACE = "questions"
+
+
+class LocalCache:
+    """In-process LRU cache with a per-entry TTL.
+
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int = None):
+        if self.max_entries <= 0:
+            return
+
+        ttl = min(ttl or self.ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self._entries.pop(key, None) is not None for key in keys)
+
+    def delete_pattern(self, pattern: str) -> int:
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        return self.delete(*keys)
+
+    def clear(self):
+        self._entries.clear()
+
+
 class CacheService:
+    """Two-tier cache: an in-process LRU (L1) in front of Redis (L2).
+
+    Deletes are broadcast to every worker over Redis pub/sub so their L1
+    copies are dropped too; L1 entries also expire after L1_CACHE_TTL.
+
+    Keys built with `namespace_key` embed the namespace's generation, a
+    counter in Redis that each worker memoizes. Invalidating a namespace is
+    one INCR: new keys stop matching the old entries, which expire by TTL.
+    """
+
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
         self.is_connected = False
+        self.codec = get_codec(settings.CACHE_CODEC)
+        self.compressor = get_compressor(settings.CACHE_COMPRESSION)
+        self.compression_threshold = settings.CACHE_COMPRESSION_THRESHOLD
+        self.local = LocalCache(settings.L1_CACHE_MAX_ENTRIES, settings.L1_CACHE_TTL)
+        self.instance_id = uuid.uuid4().hex
+        self._invalidation_listener: Optional[asyncio.Task] = None
+        self._invalidation_callbacks: List[
+            Callable[[Dict[str, Any]], Awaitable[None]]
+        ] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # namespace -> (memo expiry, generation)
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self.stats = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "loads": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+        }
+        self.compression_stats: Dict[str, Dict[str, float]] = {}
 
     async def connect(self):
         """Initialize Redis connection"""
         try:
-            self.redis_client = redis.from_url(
+            self.redis_client = InstrumentedRedis.from_url(
                 settings.redis_connection_string,
                 encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,  # values are codec-encoded bytes
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
@@ -32,6 +159,10 @@ class CacheService:
             self.is_connected = True
             logger.info("✅ Redis connection established successfully")
 
+            self._invalidation_listener = asyncio.create_task(
+                self._listen_for_invalidations()
+            )
+
         except Exception as e:
             logger.warning(f"⚠️ Redis connection failed: {e}")
             logger.warning("🔄 Application will continue without caching")
@@ -40,6 +171,14 @@ class CacheService:
 
     async def disconnect(self):
         """Close Redis connection"""
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.cancel()
+            try:
+                await self._invalidation_listener
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_listener = None
+
         if self.redis_client:
             try:
                 await self.redis_client.close()
@@ -49,16 +188,29 @@ class CacheService:
 
         self.is_connected = False
         self.redis_client = None
+        self._generations.clear()
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache, trying the local tier first"""
+        value = self.local.get(key)
+        record_cache_lookup("l1", key, value is not None)
+        if value is not None:
+            self.stats["l1_hits"] += 1
+            return value
+        self.stats["l1_misses"] += 1
+
         if not self.is_connected or not self.redis_client:
             return None
 
         try:
             cached_value = await self.redis_client.get(key)
+            record_cache_lookup("l2", key, bool(cached_value))
             if cached_value:
-                return json.loads(cached_value)
+                self.stats["l2_hits"] += 1
+                value = self._decode(key, cached_value)
+                self.local.set(key, value)
+                return value
+            self.stats["l2_misses"] += 1
             return None
         except Exception as e:
             logger.error(f"❌ Cache GET error for key '{key}': {e}")
@@ -66,71 +218,495 @@ class CacheService:
 
     async def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """Set value in cache with optional TTL"""
+        ttl = ttl or settings.CACHE_TTL
+        self.local.set(key, value, ttl)
+
         if not self.is_connected or not self.redis_client:
             return False
 
         try:
-            ttl = ttl or settings.CACHE_TTL
-            serialized_value = json.dumps(value, default=str)
+            serialized_value = self._encode(key, value)
             await self.redis_client.setex(key, ttl, serialized_value)
             return True
         except Exception as e:
             logger.error(f"❌ Cache SET error for key '{key}': {e}")
             return False
 
+    def _compression_stats_for(self, key: str) -> Dict[str, float]:
+        namespace = cache_namespace(key)
+        stats = self.compression_stats.get(namespace)
+        if stats is None:
+            stats = self.compression_stats[namespace] = {
+                "compressed": 0,
+                "skipped": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "compress_seconds": 0.0,
+                "decompressed": 0,
+                "decompress_seconds": 0.0,
+            }
+        return stats
+
+    def _encode(self, key: str, value: Any) -> bytes:
+        """Encode a value, compressing it when large enough to be worth it"""
+        data = encode_value(self.codec, value)
+        if self.compressor is None or len(data) < self.compression_threshold:
+            return data
+
+        started = time.perf_counter()
+        compressed = compress_value(self.compressor, data)
+        stats = self._compression_stats_for(key)
+        stats["compress_seconds"] += time.perf_counter() - started
+        if len(compressed) >= len(data):
+            stats["skipped"] += 1
+            return data
+
+        stats["compressed"] += 1
+        stats["bytes_in"] += len(data)
+        stats["bytes_out"] += len(compressed)
+        return compressed
+
+    def _decode(self, key: str, data: bytes) -> Any:
+        """Decode a value, decompressing it if its header says so"""
+        if is_compressed(data):
+            started = time.perf_counter()
+            data = decompress_value(data)
+            stats = self._compression_stats_for(key)
+            stats["decompressed"] += 1
+            stats["decompress_seconds"] += time.perf_counter() - started
+        return decode_value(data)
+
+    async def get_many(self, keys: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Get several values: local tier first, then one MGET for the rest.
+
+        Returns the values found and the keys still missing, so callers can
+        load only those (e.g. with one `$in` query) and `set_many` them.
+        """
+        found: Dict[str, Any] = {}
+        remote: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key)
+            record_cache_lookup("l1", key, value is not None)
+            if value is not None:
+                self.stats["l1_hits"] += 1
+                found[key] = value
+            else:
+                self.stats["l1_misses"] += 1
+                remote.append(key)
+
+        if not remote or not self.is_connected or not self.redis_client:
+            return found, remote
+
+        try:
+            cached_values = await self.redis_client.mget(remote)
+        except Exception as e:
+            logger.error(f"❌ Cache MGET error for {len(remote)} keys: {e}")
+            return found, remote
+
+        missing: List[str] = []
+        for key, cached_value in zip(remote, cached_values):
+            record_cache_lookup("l2", key, bool(cached_value))
+            if cached_value:
+                self.stats["l2_hits"] += 1
+                try:
+                    value = self._decode(key, cached_value)
+                except Exception as e:
+                    # Same as get(): an entry we can't decode is a miss
+                    logger.error(f"❌ Cache decode error for key '{key}': {e}")
+                    missing.append(key)
+                    continue
+                self.local.set(key, value)
+                found[key] = value
+            else:
+                self.stats["l2_misses"] += 1
+                missing.append(key)
+        return found, missing
+
+    async def set_many(
+        self,
+        items: Mapping[str, Any],
+        ttl: int = None,
+        ttls: Mapping[str, int] = None,
+    ) -> bool:
+        """Set several values in one pipeline; `ttls` overrides `ttl` per key"""
+        if not items:
+            return False
+
+        ttl = ttl or settings.CACHE_TTL
+        ttls = ttls or {}
+        for key, value in items.items():
+            self.local.set(key, value, ttls.get(key, ttl))
+
+        if not self.is_connected or not self.redis_client:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttls.get(key, ttl), self._encode(key, value))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Cache SET_MANY error for {len(items)} keys: {e}")
+            return False
+
     async def delete(self, *keys: str) -> int:
         """Delete keys from cache"""
-        if not self.is_connected or not self.redis_client or not keys:
+        return await self.delete_many(keys)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete keys in one pipeline and drop them from every worker's L1"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+
+        self.local.delete(*keys)
+        if not self.is_connected or not self.redis_client:
             return 0
 
         try:
-            return await self.redis_client.delete(*keys)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                pipe.delete(*keys[start : start + DELETE_BATCH_SIZE])
+            deleted = sum(await pipe.execute())
+            await self._publish_invalidation(keys=keys)
+            return deleted
         except Exception as e:
-            logger.error(f"❌ Cache DELETE error for keys {keys}: {e}")
+            logger.error(f"❌ Cache DELETE error for {len(keys)} keys: {e}")
             return 0
 
-    async def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"cache_generation:{namespace}"
+
+    async def get_generation(self, namespace: str) -> int:
+        """Current generation of a namespace, memoized for L1_CACHE_TTL.
+
+        The memo is updated by invalidations from other workers; its expiry
+        bounds staleness if one is missed, as it does for L1 entries.
+        """
+        memo = self._generations.get(namespace)
+        if memo is not None and memo[0] > time.monotonic():
+            return memo[1]
+
+        generation = 0
+        if self.is_connected and self.redis_client:
+            try:
+                stored = await self.redis_client.get(self._generation_key(namespace))
+                generation = int(stored or 0)
+            except Exception as e:
+                # Not memoized, so the next key is built from Redis again
+                logger.error(f"❌ Cache generation error for '{namespace}': {e}")
+                return memo[1] if memo else generation
+
+        self._remember_generation(namespace, generation)
+        return generation
+
+    def _remember_generation(self, namespace: str, generation: int):
+        self._generations[namespace] = (
+            time.monotonic() + settings.L1_CACHE_TTL,
+            generation,
+        )
+
+    async def namespace_key(self, namespace: str, *parts: Any) -> str:
+        """Cache key in the namespace's current generation"""
+        generation = await self.get_generation(namespace)
+        return ":".join([namespace, f"g{generation}", *map(str, parts)])
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """Move a namespace to a new generation; returns the new generation"""
+        self.local.delete_pattern(f"{namespace}:*")
+        generation = self._generations.get(namespace, (0, 0))[1] + 1
+
+        if self.is_connected and self.redis_client:
+            try:
+                generation = await self.redis_client.incr(
+                    self._generation_key(namespace)
+                )
+                await self._publish_invalidation(namespaces={namespace: generation})
+            except Exception as e:
+                logger.error(f"❌ Cache INVALIDATE error for '{namespace}': {e}")
+
+        self._remember_generation(namespace, generation)
+        return generation
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = None,
+        stale_ttl: int = 0,
+    ) -> Any:
+        """Get a cached value, running `loader` at most once per key on a miss.
+
+        Concurrent misses in this process await the same load, and a short
+        Redis lock keeps other workers from loading the same key at the same
+        time. With `stale_ttl`, values stay servable for that many seconds
+        after `ttl` while a single background load refreshes them.
+        """
+        ttl = ttl or settings.CACHE_TTL
+        cached = await self.get(key)
+        if cached is not None:
+            if not self._is_stale_envelope(cached):
+                return cached
+            if cached["fresh_until"] > time.time():
+                return cached["value"]
+
+            # Serve the stale value and refresh it once in the background
+            self.stats["stale_served"] += 1
+            if key not in self._inflight:
+                self._start_load(key, loader, ttl, stale_ttl, refresh=True)
+            return cached["value"]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._start_load(key, loader, ttl, stale_ttl)
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _is_stale_envelope(value: Any) -> bool:
+        return isinstance(value, dict) and value.get(STALE_ENVELOPE_KEY) == 1
+
+    def _start_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        refresh: bool = False,
+    ) -> asyncio.Future:
+        future = asyncio.ensure_future(self._load(key, loader, ttl, stale_ttl, refresh))
+        self._inflight[key] = future
+
+        def done(finished: asyncio.Future):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if finished.cancelled():
+                return
+            # Background refreshes have no awaiter to surface errors to
+            error = finished.exception()
+            if refresh and error is not None:
+                logger.error(f"❌ Cache refresh error for key '{key}': {error}")
+
+        future.add_done_callback(done)
+        return future
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        refresh: bool,
+    ) -> Any:
+        token = await self._acquire_lock(key)
+        if token is None:
+            # Another worker holds the lock and is loading this key
+            if refresh:
+                return None
+            value = await self._wait_for_value(key)
+            if value is not None:
+                return value["value"] if self._is_stale_envelope(value) else value
+
+        try:
+            self.stats["loads"] += 1
+            value = await loader()
+            if value is not None:
+                if stale_ttl:
+                    envelope = {
+                        STALE_ENVELOPE_KEY: 1,
+                        "fresh_until": time.time() + ttl,
+                        "value": value,
+                    }
+                    await self.set(key, envelope, ttl + stale_ttl)
+                else:
+                    await self.set(key, value, ttl)
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(key, token)
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """Take the short distributed load lock; None if another worker has it"""
+        token = uuid.uuid4().hex
         if not self.is_connected or not self.redis_client:
-            return 0
+            return token
 
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                return await self.redis_client.delete(*keys)
-            return 0
+            acquired = await self.redis_client.set(
+                f"lock:{key}", token, nx=True, px=settings.CACHE_LOCK_TTL_MS
+            )
+            return token if acquired else None
         except Exception as e:
-            logger.error(f"❌ Cache DELETE_PATTERN error for pattern '{pattern}': {e}")
-            return 0
+            logger.error(f"❌ Cache lock error for key '{key}': {e}")
+            return token
 
-    async def invalidate_questions_cache(self):
-        """Invalidate all question-related cache entries"""
-        patterns = [
-            "questions:*",
-            "random_questions:*",
-            "question_count",
-        ]
+    async def _release_lock(self, key: str, token: str):
+        if not self.is_connected or not self.redis_client:
+            return
+
+        try:
+            await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+        except Exception as e:
+            logger.error(f"❌ Cache unlock error for key '{key}': {e}")
 
-        deleted_count = 0
-        for pattern in patterns:
-            deleted_count += await self.delete_pattern(pattern)
+    async def _wait_for_value(self, key: str) -> Optional[Any]:
+        """Poll Redis until the lock holder stores the value or the lock expires"""
+        deadline = time.monotonic() + settings.CACHE_LOCK_TTL_MS / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            try:
+                cached_value = await self.redis_client.get(key)
+                if cached_value:
+                    return self._decode(key, cached_value)
+                if not await self.redis_client.exists(f"lock:{key}"):
+                    return None
+            except Exception as e:
+                logger.error(f"❌ Cache wait error for key '{key}': {e}")
+                return None
+        return None
 
-        if deleted_count > 0:
-            logger.info(f"🗑️ Invalidated {deleted_count} question cache entries")
+    def add_invalidation_callback(
+        self, callback: Callable[[Dict[str, Any]], Awaitable[None]]
+    ):
+        """Run `callback` for invalidations published by other workers"""
+        self._invalidation_callbacks.append(callback)
 
-        return deleted_count
+    async def _publish_invalidation(
+        self, keys: List[str] = (), namespaces: Dict[str, int] = None
+    ):
+        message = {
+            "origin": self.instance_id,
+            "keys": list(keys),
+            "namespaces": namespaces or {},
+        }
+        await self.redis_client.publish(
+            settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message)
+        )
 
-    def get_questions_cache_key(self, limit: int = None, skip: int = None) -> str:
+    async def _apply_invalidation(self, message: Dict[str, Any]):
+        if message.get("origin") == self.instance_id:
+            return
+
+        self.local.delete(*message.get("keys", []))
+        for namespace, generation in message.get("namespaces", {}).items():
+            self.local.delete_pattern(f"{namespace}:*")
+            self._remember_generation(namespace, generation)
+
+        for callback in self._invalidation_callbacks:
+            try:
+                await callback(message)
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation callback error: {e}")
+
+    async def _listen_for_invalidations(self):
+        """Drop L1 entries invalidated by other workers"""
+        while True:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        await self._apply_invalidation(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Anything published while disconnected may have been missed
+                logger.warning(f"⚠️ Cache invalidation listener error: {e}")
+                self.local.clear()
+                self._generations.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier hit counters and hit rates"""
+
+        def tier(hits: int, misses: int) -> Dict[str, Any]:
+            lookups = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+        return {
+            "l1": {
+                **tier(self.stats["l1_hits"], self.stats["l1_misses"]),
+                "size": len(self.local),
+            },
+            "l2": tier(self.stats["l2_hits"], self.stats["l2_misses"]),
+            "loader": {
+                "loads": self.stats["loads"],
+                "coalesced": self.stats["coalesced"],
+                "stale_served": self.stats["stale_served"],
+                "in_flight": len(self._inflight),
+            },
+            "compression": {
+                "codec": self.compressor.name if self.compressor else "none",
+                "threshold_bytes": self.compression_threshold,
+                "namespaces": {
+                    namespace: {
+                        "compressed": stats["compressed"],
+                        "skipped": stats["skipped"],
+                        "bytes_saved": stats["bytes_in"] - stats["bytes_out"],
+                        "ratio": (
+                            round(stats["bytes_out"] / stats["bytes_in"], 4)
+                            if stats["bytes_in"]
+                            else None
+                        ),
+                        "compress_ms": round(stats["compress_seconds"] * 1000, 3),
+                        "decompressed": stats["decompressed"],
+                        "decompress_ms": round(stats["decompress_seconds"] * 1000, 3),
+                    }
+                    for namespace, stats in self.compression_stats.items()
+                },
+            },
+        }
+
+    async def invalidate_questions_cache(self) -> int:
+        """Invalidate all question-related cache entries"""
+        generation = await self.invalidate_namespace(QUESTIONS_NAMESPACE)
+        logger.info(f"🗑️ Question cache moved to generation {generation}")
+        return generation
+
+    async def get_questions_cache_key(self, limit: int = None, skip: int = None) -> str:
         """Generate cache key for questions list"""
-        return f"questions:list:limit_{limit}:skip_{skip}"
+        return await self.namespace_key(
+            QUESTIONS_NAMESPACE, "list", f"limit_{limit}", f"skip_{skip}"
+        )
 
-    def get_question_cache_key(self, question_id: str) -> str:
+    async def get_question_cache_key(self, question_id: str) -> str:
         """Generate cache key for single question"""
-        return f"questions:single:{question_id}"
+        return await self.namespace_key(QUESTIONS_NAMESPACE, "single", question_id)
+
+    async def get_question_count_cache_key(self) -> str:
+        return await self.namespace_key(QUESTIONS_NAMESPACE, "count")
+
+    async def get_admin_questions_cache_key(
+        self, limit: int, skip: int, include_answers: bool
+    ) -> str:
+        return await self.namespace_key(
+            QUESTIONS_NAMESPACE,
+            "admin_list",
+            f"limit_{limit}",
+            f"skip_{skip}",
+            f"answers_{include_answers}",
+        )
+
+    async def get_admin_question_cache_key(self, question_id: str) -> str:
+        return await self.namespace_key(
+            QUESTIONS_NAMESPACE, "admin_single", question_id
+        )
 
-    def get_random_questions_cache_key(self, count: int) -> str:
-        """Generate cache key for random questions"""
-        return f"random_questions:{count}"
+    async def get_admin_question_count_cache_key(self) -> str:
+        return await self.namespace_key(QUESTIONS_NAMESPACE, "admin_count")
 
 
 # Global cache service instance
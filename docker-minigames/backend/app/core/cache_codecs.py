@@ -0,0 +1,189 @@
+# app/core/cache_codecs.py
+
+import json
+import logging
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+from bson import ObjectId
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4 = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheCodec:
+    """Serializer for cached values.
+
+    Every encoded value starts with the codec's one-byte tag so values
+    written by any codec (or by older releases, untagged) stay readable.
+    """
+
+    name = ""
+    tag = b""
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+    """Plain JSON; datetimes and ObjectIds come back as strings"""
+
+    name = "json"
+    tag = b"\x01"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(CacheCodec):
+    """Binary msgpack that round-trips datetimes and ObjectIds"""
+
+    name = "msgpack"
+    tag = b"\x02"
+
+    EXT_DATETIME = 1
+    EXT_OBJECT_ID = 2
+
+    def _default(self, value: Any):
+        if isinstance(value, datetime):
+            return msgpack.ExtType(self.EXT_DATETIME, value.isoformat().encode())
+        if isinstance(value, ObjectId):
+            return msgpack.ExtType(self.EXT_OBJECT_ID, value.binary)
+        return str(value)
+
+    def _ext_hook(self, code: int, data: bytes):
+        if code == self.EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == self.EXT_OBJECT_ID:
+            return ObjectId(data)
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False)
+
+
+CODECS: Dict[str, CacheCodec] = {"json": JsonCodec()}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+CODECS_BY_TAG: Dict[bytes, CacheCodec] = {codec.tag: codec for codec in CODECS.values()}
+
+
+def get_codec(name: str) -> CacheCodec:
+    """Look up a codec by name, falling back to JSON if it is unavailable"""
+    codec = CODECS.get(name)
+    if codec is None:
+        logger.warning(f"⚠️ Cache codec '{name}' unavailable, using json")
+        return CODECS["json"]
+    return codec
+
+
+# First byte of a compressed value, followed by the compressor's tag. Codec
+# tags and untagged JSON text never start with it.
+COMPRESSED_FLAG = b"\x80"
+
+
+class Compressor:
+    """Compression applied on top of an encoded value"""
+
+    name = ""
+    tag = b""
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class ZlibCompressor(Compressor):
+    """Standard-library fallback at its fastest level"""
+
+    name = "zlib"
+    tag = b"\x01"
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, 1)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    """LZ4 frames: several times faster than zlib, slightly larger output"""
+
+    name = "lz4"
+    tag = b"\x02"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+
+COMPRESSORS: Dict[str, Compressor] = {"zlib": ZlibCompressor()}
+if lz4 is not None:
+    COMPRESSORS["lz4"] = Lz4Compressor()
+
+COMPRESSORS_BY_TAG: Dict[bytes, Compressor] = {
+    compressor.tag: compressor for compressor in COMPRESSORS.values()
+}
+
+
+def get_compressor(name: str) -> Optional[Compressor]:
+    """Look up a compressor by name; "none" disables compression"""
+    if name == "none":
+        return None
+    compressor = COMPRESSORS.get(name)
+    if compressor is None:
+        logger.warning(f"⚠️ Cache compressor '{name}' unavailable, using zlib")
+        return COMPRESSORS["zlib"]
+    return compressor
+
+
+def is_compressed(data: bytes) -> bool:
+    return data[:1] == COMPRESSED_FLAG
+
+
+def compress_value(compressor: Compressor, data: bytes) -> bytes:
+    return COMPRESSED_FLAG + compressor.tag + compressor.compress(data)
+
+
+def decompress_value(data: bytes) -> bytes:
+    """Undo compress_value; other values are returned unchanged"""
+    if not is_compressed(data):
+        return data
+    return COMPRESSORS_BY_TAG[data[1:2]].decompress(data[2:])
+
+
+def encode_value(codec: CacheCodec, value: Any) -> bytes:
+    return codec.tag + codec.dumps(value)
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a cached value written by any codec, compressed or not"""
+    data = decompress_value(data)
+    codec = CODECS_BY_TAG.get(data[:1])
+    if codec is None:
+        # Untagged values were written as JSON text before codecs existed
+        return json.loads(data)
+    return codec.loads(data[1:])
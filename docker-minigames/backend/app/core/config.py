@@ -26,6 +26,78 @@ class Settings:
         os.getenv("QUESTIONS_CACHE_TTL", "7200")
     )  # 2 hours for questions
 
+    QUESTIONS_STALE_TTL: int = int(
+        os.getenv("QUESTIONS_STALE_TTL", "300")
+    )  # Serve stale questions while one request reloads them (0 disables)
+    CACHE_LOCK_TTL_MS: int = int(os.getenv("CACHE_LOCK_TTL_MS", "5000"))
+
+    # Admin NDJSON import/export of the question bank
+    QUESTION_IMPORT_CHUNK_SIZE: int = int(
+        os.getenv("QUESTION_IMPORT_CHUNK_SIZE", "500")
+    )  # Questions validated and written per bulk_write
+    QUESTION_STREAM_BATCH_SIZE: int = int(
+        os.getenv("QUESTION_STREAM_BATCH_SIZE", "500")
+    )  # Cursor batch size, and questions per chunk of exports and streamed lists
+
+    CACHE_CODEC: str = os.getenv("CACHE_CODEC", "msgpack")  # msgpack or json
+    # lz4 (falls back to zlib when not installed), zlib or none
+    CACHE_COMPRESSION: str = os.getenv("CACHE_COMPRESSION", "lz4")
+    CACHE_COMPRESSION_THRESHOLD: int = int(
+        os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024")
+    )  # Encoded values at least this many bytes are compressed
+
+    # In-process L1 cache in front of Redis
+    L1_CACHE_MAX_ENTRIES: int = int(os.getenv("L1_CACHE_MAX_ENTRIES", "1024"))
+    L1_CACHE_TTL: int = int(os.getenv("L1_CACHE_TTL", "30"))  # seconds
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv(
+        "CACHE_INVALIDATION_CHANNEL", "quiz-cache-invalidation"
+    )
+
+    # WebSocket Configuration
+    LEADERBOARD_BROADCAST_INTERVAL_MS: int = int(
+        os.getenv("LEADERBOARD_BROADCAST_INTERVAL_MS", "250")
+    )  # At most one leaderboard emit per tick
+    LEADERBOARD_SESSION_TTL: int = int(
+        os.getenv("LEADERBOARD_SESSION_TTL", "86400")
+    )  # Idle sessions' leaderboard keys in Redis expire after this (seconds)
+    LEADERBOARD_SESSION_IDLE_SECONDS: int = int(
+        os.getenv("LEADERBOARD_SESSION_IDLE_SECONDS", "600")
+    )  # Per-session broadcast state is dropped from memory after this
+    LEADERBOARD_MAX_SESSIONS: int = int(os.getenv("LEADERBOARD_MAX_SESSIONS", "1000"))
+
+    # Multi-worker Socket.IO: share emits between workers over Redis pub/sub
+    SOCKETIO_REDIS_ENABLED: bool = (
+        os.getenv("SOCKETIO_REDIS_ENABLED", "false").lower() == "true"
+    )
+    SOCKETIO_REDIS_CHANNEL: str = os.getenv("SOCKETIO_REDIS_CHANNEL", "quiz-socketio")
+    UVICORN_WORKERS: int = int(os.getenv("UVICORN_WORKERS", "1"))
+    # json (orjson when installed) or msgpack; msgpack clients need
+    # socket.io-msgpack-parser
+    SOCKETIO_SERIALIZER: str = os.getenv("SOCKETIO_SERIALIZER", "json")
+
+    # Server-driven game sessions
+    SESSION_QUESTION_COUNT: int = int(os.getenv("SESSION_QUESTION_COUNT", "10"))
+    SESSION_ROUND_LEAD_MS: int = int(
+        os.getenv("SESSION_ROUND_LEAD_MS", "500")
+    )  # Rounds open this long after being pushed so every client starts together
+    SESSION_INTERMISSION_SECONDS: float = float(
+        os.getenv("SESSION_INTERMISSION_SECONDS", "5")
+    )
+    SESSION_CHECKPOINT_TTL: int = int(os.getenv("SESSION_CHECKPOINT_TTL", "3600"))
+    SESSION_LEASE_MS: int = int(
+        os.getenv("SESSION_LEASE_MS", "10000")
+    )  # A worker that stops renewing its sessions' lease hands them over after this
+    SESSION_FORWARD_TIMEOUT_MS: int = int(
+        os.getenv("SESSION_FORWARD_TIMEOUT_MS", "2000")
+    )
+
+    # Answer event log (batched write-behind to the answers collection)
+    ANSWER_LOG_FLUSH_SIZE: int = int(os.getenv("ANSWER_LOG_FLUSH_SIZE", "500"))
+    ANSWER_LOG_FLUSH_INTERVAL_MS: int = int(
+        os.getenv("ANSWER_LOG_FLUSH_INTERVAL_MS", "1000")
+    )
+    ANSWER_LOG_MAX_BUFFER: int = int(os.getenv("ANSWER_LOG_MAX_BUFFER", "10000"))
+
     # Admin Configuration
     ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "your-secure-admin-key-here")
 
@@ -0,0 +1,238 @@
+# app/core/observability.py
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from fastapi import Response
+from pymongo import monitoring
+from prometheus_client import (
+    Counter,
+    Histogram,
+    Gauge,
+    generate_latest,
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+)
+
+# HTTP
+request_count = Counter(
+    "http_requests_total",
+    "Total HTTP requests",
+    ["method", "route", "status"],
+)
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration in seconds, per route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Answer scoring (verify, score, persist, emit)
+answer_duration = Histogram(
+    "quiz_answer_duration_seconds",
+    "Time to score and record an answer",
+    ["channel"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Datastores
+database_operations = Counter(
+    "mongodb_operations_total",
+    "Total MongoDB commands",
+    ["command", "collection", "status"],
+)
+
+database_duration = Histogram(
+    "mongodb_operation_duration_seconds",
+    "MongoDB command duration in seconds",
+    ["command", "collection"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+redis_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command (or pipeline) duration in seconds",
+    ["command", "status"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+
+cache_requests = Counter(
+    "cache_requests_total",
+    "Cache lookups per tier and key namespace",
+    ["tier", "namespace", "result"],
+)
+
+# Socket.IO
+socketio_clients = Gauge(
+    "socketio_connected_clients", "Socket.IO clients connected to this process"
+)
+
+socketio_emits = Counter("socketio_emits_total", "Socket.IO emits", ["event", "status"])
+
+socketio_emit_duration = Histogram(
+    "socketio_emit_duration_seconds",
+    "Time to encode and hand off a Socket.IO emit",
+    ["event"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+
+
+def cache_namespace(key: str) -> str:
+    """Metric label for a cache key: everything before the first ':'"""
+    return key.split(":", 1)[0]
+
+
+def record_cache_lookup(tier: str, key: str, hit: bool):
+    cache_requests.labels(
+        tier=tier, namespace=cache_namespace(key), result="hit" if hit else "miss"
+    ).inc()
+
+
+@contextmanager
+def observe_emit(event: str):
+    """Count and time a Socket.IO emit"""
+    started = time.perf_counter()
+    status = "success"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        socketio_emits.labels(event=event, status=status).inc()
+        socketio_emit_duration.labels(event=event).observe(
+            time.perf_counter() - started
+        )
+
+
+class RequestMetricsMiddleware:
+    """Records HTTP request counts and latency per route template.
+
+    A plain ASGI middleware: latency is observed when the last body chunk
+    has been sent, so streamed responses are timed in full rather than to
+    their headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            # Label by template (/api/leaderboard/rank/{player_id}) to keep
+            # cardinality bounded; unmatched paths share one label
+            route_path = getattr(scope.get("route"), "path", "unmatched")
+            request_duration.labels(method=scope["method"], route=route_path).observe(
+                time.perf_counter() - started
+            )
+            request_count.labels(
+                method=scope["method"], route=route_path, status=str(status_code)
+            ).inc()
+
+        async def send_and_record(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                record()
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            # Errors and client disconnects before the last chunk
+            record()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command through PyMongo's monitoring hooks"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[int, int], str] = {}
+
+    @staticmethod
+    def _key(event) -> Tuple[int, int]:
+        return event.request_id, event.operation_id or 0
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            # getMore names its cursor first and the collection separately
+            collection = event.command.get("collection")
+        self._collections[self._key(event)] = (
+            collection if isinstance(collection, str) else ""
+        )
+
+    def _finish(self, event, status: str):
+        collection = self._collections.pop(self._key(event), "")
+        database_operations.labels(
+            command=event.command_name, collection=collection, status=status
+        ).inc()
+        database_duration.labels(
+            command=event.command_name, collection=collection
+        ).observe(event.duration_micros / 1_000_000)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        started = time.perf_counter()
+        status = "success"
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            redis_duration.labels(command=command, status=status).observe(
+                time.perf_counter() - started
+            )
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that records the duration of every command"""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        status = "success"
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            redis_duration.labels(command=str(args[0]).upper(), status=status).observe(
+                time.perf_counter() - started
+            )
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def get_metrics():
+    """Return Prometheus metrics"""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
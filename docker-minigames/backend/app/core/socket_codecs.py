@@ -0,0 +1,70 @@
+# app/core/socket_codecs.py
+
+import json
+from datetime import datetime
+from typing import Any
+from bson import ObjectId
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+    from socketio.msgpack_packet import MsgPackPacket
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+    MsgPackPacket = None
+
+
+def _default(value: Any) -> Any:
+    """Encode values the wire formats don't support natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return str(value)
+
+
+class SocketJson:
+    """Drop-in `json` module for python-socketio/engineio packets.
+
+    Handles datetimes and ObjectIds while encoding, so emit payloads need no
+    pre-serialization pass and are encoded exactly once per broadcast.
+    Uses orjson when it is installed.
+    """
+
+    @staticmethod
+    def dumps(value: Any, **kwargs) -> str:
+        if orjson is not None:
+            return orjson.dumps(
+                value, default=_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(value, default=_default, **kwargs)
+
+    @staticmethod
+    def loads(data: Any, **kwargs) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data, **kwargs)
+
+
+if MsgPackPacket is not None:
+
+    class SocketMsgPackPacket(MsgPackPacket):
+        """Binary Socket.IO packets (clients need socket.io-msgpack-parser)"""
+
+        def encode(self):
+            return msgpack.dumps(self._to_dict(), default=_default)
+
+else:
+    SocketMsgPackPacket = None
+
+
+def get_socketio_serializer(name: str):
+    """Socket.IO `serializer` argument for SOCKETIO_SERIALIZER"""
+    if name == "msgpack" and SocketMsgPackPacket is not None:
+        return SocketMsgPackPacket
+    return "default"
@@ -0,0 +1,66 @@
+# app/core/streaming.py
+
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, Mapping
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True if the client asked for NDJSON in its Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def stream_cursor(
+    cursor,
+    render: Callable[[Mapping[str, Any]], bytes],
+    batch_size: int,
+    ndjson: bool = False,
+    label: str = "documents",
+    headers: Dict[str, str] = None,
+) -> StreamingResponse:
+    """Stream a Motor cursor as a JSON array or as NDJSON.
+
+    `render` turns one document into its JSON bytes. Items are sent one
+    chunk per `batch_size` documents, so memory use does not grow with the
+    result and the first bytes go out after the first batch.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        chunk = []
+        sent = 0
+        try:
+            if not ndjson:
+                yield b"["
+            async for document in cursor:
+                item = render(document)
+                if ndjson:
+                    chunk.append(item + b"\n")
+                else:
+                    chunk.append(item if sent == 0 and not chunk else b"," + item)
+                if len(chunk) >= batch_size:
+                    sent += len(chunk)
+                    yield b"".join(chunk)
+                    chunk = []
+            sent += len(chunk)
+            if not ndjson:
+                chunk.append(b"]")
+            if chunk:
+                yield b"".join(chunk)
+            logger.info(f"📤 Streamed {sent} {label}")
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error(f"❌ Error streaming {label} after {sent}: {e}")
+            raise
+        finally:
+            await cursor.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+        headers=headers,
+    )
@@ -1,70 +1,722 @@
 import socketio
-from typing import Dict, Any
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.models.question import AnswerSubmission, AnswerResponse
+from app.models.player import DEFAULT_SESSION_ID, SessionJoin
+from app.services.game_session_service import SessionError
+from app.services.player_service import player_service
+from typing import Dict, Any, Callable, Awaitable, Optional, List
+from collections import OrderedDict
+from functools import partial
+import asyncio
 import logging
 import json
-from datetime import datetime
+import time
+import uuid
+from redis.exceptions import WatchError
+from app.core.config import settings
+from app.core.cache import cache_service
+from app.core.observability import observe_emit, socketio_clients
 
 logger = logging.getLogger(__name__)
 
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder for datetime objects"""
+class LeaderboardVersions:
+    """Versioned leaderboard snapshots with delta encoding.
 
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+    Every published leaderboard that differs from the previous one gets the
+    next version. Broadcasts carry only rank/score changes against the
+    previous version; reconnecting clients are resynced from any version
+    still in the history window.
+
+    Version numbers restart whenever the history does (a restart, an
+    evicted or expired session), so every payload also carries an epoch
+    naming the history it belongs to; clients from another epoch are
+    resynced with a snapshot.
+    """
+
+    def __init__(self, history_size: int = 32):
+        self.version = 0
+        self.epoch = self._new_epoch()
+        self._history: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._history_size = history_size
+
+    @staticmethod
+    def _new_epoch() -> str:
+        return uuid.uuid4().hex[:12]
+
+    def _start_epoch(self, epoch: str):
+        """Switch to another epoch's history, dropping this one's versions"""
+        if epoch != self.epoch:
+            self.epoch = epoch
+            self.version = 0
+            self._history.clear()
+
+    @property
+    def current(self) -> List[Dict[str, Any]]:
+        return self._history[self.version] if self._history else []
+
+    @staticmethod
+    def _rank(leaderboard: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{**entry, "rank": rank} for rank, entry in enumerate(leaderboard, 1)]
+
+    def _record(self, version: int, entries: List[Dict[str, Any]]):
+        self._history[version] = entries
+        self._history.move_to_end(version)
+        self.version = max(self.version, version)
+        while len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+
+    def _payload_since(self, previous_version: int) -> Dict[str, Any]:
+        if previous_version in self._history:
+            return self.diff(previous_version)
+        return self.snapshot()
+
+    async def publish(
+        self, leaderboard: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Record a new leaderboard; returns the payload to broadcast, if any"""
+        entries = self._rank(leaderboard)
+        if self._history and entries == self.current:
+            return None
+
+        previous_version = self.version
+        self._record(self.version + 1, entries)
+        return self._payload_since(previous_version)
+
+    async def refresh(self):
+        """Pick up versions published elsewhere (no-op for a single process)"""
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": "snapshot",
+            "version": self.version,
+            "epoch": self.epoch,
+            "leaderboard": self.current,
+        }
+
+    def diff(self, base_version: int) -> Optional[Dict[str, Any]]:
+        """Changes from `base_version` to the current version"""
+        base = self._history.get(base_version)
+        if base is None:
+            return None
+
+        base_by_id = {entry["id"]: entry for entry in base}
+        updated, added = [], []
+        for entry in self.current:
+            previous = base_by_id.pop(entry["id"], None)
+            if previous is None:
+                added.append(entry)
+            elif (
+                previous["rank"] != entry["rank"] or previous["score"] != entry["score"]
+            ):
+                updated.append(
+                    {"id": entry["id"], "rank": entry["rank"], "score": entry["score"]}
+                )
+
+        return {
+            "type": "delta",
+            "version": self.version,
+            "epoch": self.epoch,
+            "base_version": base_version,
+            "updated": updated,
+            "added": added,
+            "removed": list(base_by_id),
+        }
+
+    def resync(
+        self, last_version: Optional[int], last_epoch: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Smallest payload that brings a client at `last_version` up to date"""
+        snapshot = self.snapshot()
+        delta = (
+            self.diff(last_version)
+            if last_version is not None and last_epoch == self.epoch
+            else None
+        )
+        if delta is None:
+            return snapshot
+
+        if len(json.dumps(delta, default=str)) < len(json.dumps(snapshot, default=str)):
+            return delta
+        return snapshot
+
+
+class RedisLeaderboardVersions(LeaderboardVersions):
+    """Leaderboard versions shared by every worker through Redis.
+
+    The current version, epoch and snapshot of each session live in Redis,
+    so deltas broadcast by any worker are computed against the globally
+    previous version. A new epoch starts whenever the version key is
+    created, e.g. after it expired. Falls back to process-local versions when Redis is
+    unavailable. Keys of sessions other than the default expire once the
+    session has been idle for LEADERBOARD_SESSION_TTL.
+    """
+
+    MAX_RETRIES = 3
+
+    def __init__(self, session_id: str = DEFAULT_SESSION_ID, history_size: int = 32):
+        super().__init__(history_size)
+        self.version_key = f"leaderboard:broadcast:{session_id}:version"
+        self.snapshot_key = f"leaderboard:broadcast:{session_id}:snapshot"
+        self.epoch_key = f"leaderboard:broadcast:{session_id}:epoch"
+        self.ttl = (
+            None
+            if session_id == DEFAULT_SESSION_ID
+            else settings.LEADERBOARD_SESSION_TTL
+        )
+
+    @property
+    def redis(self):
+        return cache_service.redis_client if cache_service.is_connected else None
+
+    def _record_shared(
+        self,
+        version: Optional[bytes],
+        snapshot: Optional[bytes],
+        epoch: Optional[bytes],
+    ):
+        if version is not None and snapshot is not None and epoch is not None:
+            self._start_epoch(epoch.decode())
+            self._record(int(version), json.loads(snapshot))
+
+    async def publish(
+        self, leaderboard: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return await super().publish(leaderboard)
+
+        entries = self._rank(leaderboard)
+        encoded = json.dumps(entries, default=str).encode()
+        for _ in range(self.MAX_RETRIES):
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    await pipe.watch(self.version_key, self.epoch_key)
+                    version, snapshot, epoch = await pipe.mget(
+                        self.version_key, self.snapshot_key, self.epoch_key
+                    )
+                    if snapshot == encoded and epoch is not None:
+                        self._record_shared(version, snapshot, epoch)
+                        return None
+
+                    # Versions restart from 1 in a new epoch
+                    new_epoch = (
+                        epoch.decode() if epoch and version else self._new_epoch()
+                    )
+                    pipe.multi()
+                    pipe.incr(self.version_key)
+                    pipe.set(self.snapshot_key, encoded, ex=self.ttl)
+                    pipe.set(self.epoch_key, new_epoch, ex=self.ttl)
+                    if self.ttl:
+                        pipe.expire(self.version_key, self.ttl)
+                    new_version = (await pipe.execute())[0]
+            except WatchError:
+                # Another worker published first; compare against its version
+                continue
+            except Exception as e:
+                logger.error(f"Error publishing shared leaderboard version: {e}")
+                return await super().publish(leaderboard)
+
+            self._record_shared(version, snapshot, epoch)
+            self._start_epoch(new_epoch)
+            self._record(new_version, entries)
+            return self._payload_since(int(version) if version else 0)
+
+        logger.warning("Shared leaderboard version kept changing; skipping emit")
+        return None
+
+    async def refresh(self):
+        if self.redis is None:
+            return
+        try:
+            version, snapshot, epoch = await self.redis.mget(
+                self.version_key, self.snapshot_key, self.epoch_key
+            )
+            self._record_shared(version, snapshot, epoch)
+        except Exception as e:
+            logger.error(f"Error refreshing shared leaderboard version: {e}")
+
+
+class LeaderboardBroadcaster:
+    """Coalesces leaderboard updates into at most one emit per tick.
+
+    Callers mark the leaderboard dirty; a single pending flush loads the
+    latest snapshot and emits it once the tick interval has elapsed since
+    the previous flush. Marks that arrive while a flush is pending are
+    counted as suppressed emits.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], Awaitable[None]],
+        loader: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float,
+    ):
+        self._emit = emit
+        self._loader = loader
+        self.interval = interval
+        self._pending: Optional[asyncio.Task] = None
+        self._last_flush = 0.0
+        self.requested = 0
+        self.sent = 0
+        self.suppressed = 0
+
+    def mark_dirty(self):
+        """Request a leaderboard broadcast on the next tick"""
+        self.requested += 1
+        if self._pending is not None and not self._pending.done():
+            self.suppressed += 1
+            return
+        self._pending = asyncio.create_task(self._flush_after_tick())
+
+    async def _flush_after_tick(self):
+        delay = self._last_flush + self.interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # Clear the pending slot first so marks during the load schedule
+        # another flush instead of being lost
+        self._pending = None
+        self._last_flush = time.monotonic()
+        try:
+            await self._emit(await self._loader())
+            self.sent += 1
+        except Exception as e:
+            logger.error(f"Error flushing leaderboard broadcast: {e}")
+
+    async def close(self):
+        """Cancel any pending flush"""
+        if self._pending is not None and not self._pending.done():
+            self._pending.cancel()
+            try:
+                await self._pending
+            except asyncio.CancelledError:
+                pass
+        self._pending = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "interval_ms": int(self.interval * 1000),
+            "requested": self.requested,
+            "sent": self.sent,
+            "suppressed": self.suppressed,
+        }
 
 
 class WebSocketManager:
-    def __init__(self, sio: socketio.AsyncServer):
+    """Socket.IO events and broadcasts, scoped to game sessions.
+
+    Every game session has a room, `session:<id>`, that its players join;
+    the session's host sockets also join `session:<id>:host`. Player events
+    and the versioned leaderboard go to the session room and per-player
+    answers only to the host room, so concurrent games never see each
+    other's traffic.
+
+    Leaderboard versions and broadcasters of sessions other than the
+    default are kept for the LEADERBOARD_MAX_SESSIONS most recently used
+    sessions and dropped after LEADERBOARD_SESSION_IDLE_SECONDS idle; a
+    returning session starts again from a snapshot.
+    """
+
+    def __init__(
+        self,
+        sio: socketio.AsyncServer,
+        leaderboard_loader: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+        shared: bool = False,
+        answer_handler: Optional[
+            Callable[[AnswerSubmission, str], Awaitable[AnswerResponse]]
+        ] = None,
+        session_engine=None,
+    ):
         self.sio = sio
+        self.leaderboard_loader = leaderboard_loader
+        self.answer_handler = answer_handler
+        self.session_engine = session_engine
+        self.shared = shared
+        self.leaderboard_versions: Dict[str, LeaderboardVersions] = {}
+        self.leaderboard_broadcasters: Dict[str, LeaderboardBroadcaster] = {}
+        # Last use of each non-default session's leaderboard state, oldest first
+        self._session_last_used: "OrderedDict[str, float]" = OrderedDict()
+        self.sessions_evicted = 0
         self.setup_events()
 
+    @staticmethod
+    def session_room(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    @staticmethod
+    def host_room(session_id: str) -> str:
+        return f"session:{session_id}:host"
+
+    def _touch_session(self, session_id: str):
+        """Mark a session's leaderboard state used and evict idle sessions"""
+        if session_id == DEFAULT_SESSION_ID:
+            return
+        now = time.monotonic()
+        self._session_last_used[session_id] = now
+        self._session_last_used.move_to_end(session_id)
+
+        while self._session_last_used:
+            oldest, last_used = next(iter(self._session_last_used.items()))
+            if (
+                len(self._session_last_used) <= settings.LEADERBOARD_MAX_SESSIONS
+                and now - last_used < settings.LEADERBOARD_SESSION_IDLE_SECONDS
+            ):
+                break
+            # A pending flush still finishes; it only recreates the versions
+            del self._session_last_used[oldest]
+            self.leaderboard_versions.pop(oldest, None)
+            self.leaderboard_broadcasters.pop(oldest, None)
+            self.sessions_evicted += 1
+
+    def _versions_for(self, session_id: str) -> LeaderboardVersions:
+        self._touch_session(session_id)
+        versions = self.leaderboard_versions.get(session_id)
+        if versions is None:
+            versions = (
+                RedisLeaderboardVersions(session_id)
+                if self.shared
+                else LeaderboardVersions()
+            )
+            self.leaderboard_versions[session_id] = versions
+        return versions
+
+    def _broadcaster_for(self, session_id: str) -> Optional[LeaderboardBroadcaster]:
+        if not self.leaderboard_loader:
+            return None
+
+        self._touch_session(session_id)
+        broadcaster = self.leaderboard_broadcasters.get(session_id)
+        if broadcaster is None:
+            broadcaster = LeaderboardBroadcaster(
+                partial(self.publish_leaderboard, session_id=session_id),
+                partial(self.leaderboard_loader, session_id),
+                settings.LEADERBOARD_BROADCAST_INTERVAL_MS / 1000,
+            )
+            self.leaderboard_broadcasters[session_id] = broadcaster
+        return broadcaster
+
     def setup_events(self):
         @self.sio.event
         async def connect(sid, environ):
+            socketio_clients.inc()
             logger.info(f"Client {sid} connected")
             print(f"🔌 Client {sid} connected")
 
         @self.sio.event
         async def disconnect(sid):
+            socketio_clients.dec()
             logger.info(f"Client {sid} disconnected")
             print(f"🔌 Client {sid} disconnected")
 
-    def _serialize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Serialize data to ensure JSON compatibility"""
+        @self.sio.event
+        async def join_session(sid, data=None):
+            """Join a session's room; acknowledged with its leaderboard"""
+            return await self.handle_join_session(sid, data, host=False)
+
+        @self.sio.event
+        async def host_session(sid, data=None):
+            """Join a session as its host to also receive per-player events"""
+            return await self.handle_join_session(sid, data, host=True)
+
+        @self.sio.event
+        async def leaderboard_sync(sid, data=None):
+            """Acknowledge with a diff or snapshot from the client's last version"""
+            data = data or {}
+            last_version = data.get("version")
+            if not isinstance(last_version, int):
+                last_version = None
+            last_epoch = data.get("epoch")
+            if not isinstance(last_epoch, str):
+                last_epoch = None
+
+            session_id = data.get("session_id")
+            if not isinstance(session_id, str):
+                socket_session = await self.sio.get_session(sid)
+                session_id = socket_session.get("session_id", DEFAULT_SESSION_ID)
+            return await self.get_leaderboard_resync(
+                last_version, session_id, last_epoch
+            )
+
+        @self.sio.event
+        async def submit_answer(sid, data=None):
+            """Score an answer and acknowledge with the AnswerResponse"""
+            return await self.handle_submit_answer(data)
+
+        @self.sio.event
+        async def start_session(sid, data=None):
+            """Host: start a server-driven game in the host's session"""
+            count = (data or {}).get("question_count")
+            return await self.handle_session_request(
+                sid,
+                lambda session_id: self.session_engine.start(
+                    session_id, count if isinstance(count, int) and count > 0 else None
+                ),
+                host=True,
+            )
+
+        @self.sio.event
+        async def close_round(sid, data=None):
+            """Host: close the open round before its time limit"""
+            return await self.handle_session_request(
+                sid,
+                lambda session_id: self.session_engine.close_now(session_id),
+                host=True,
+            )
+
+        @self.sio.event
+        async def session_answer(sid, data=None):
+            """Answer the open round; the server times the answer"""
+            selected_option = (data or {}).get("selected_option")
+            if not isinstance(selected_option, int) or not 0 <= selected_option <= 3:
+                return {"error": "Invalid selected option", "status_code": 422}
+
+            socket_session = await self.sio.get_session(sid)
+            player_id = socket_session.get("player_id")
+            if not player_id:
+                return {
+                    "error": "Join the session as a player first",
+                    "status_code": 403,
+                }
+            return await self.handle_session_request(
+                sid,
+                lambda session_id: self.session_engine.submit_answer(
+                    session_id, player_id, selected_option, sid
+                ),
+            )
+
+        @self.sio.event
+        async def session_state(sid, data=None):
+            """Current round of the socket's session, for late joiners"""
+            socket_session = await self.sio.get_session(sid)
+            session_id = socket_session.get("session_id", DEFAULT_SESSION_ID)
+            state = None
+            if self.session_engine:
+                try:
+                    state = await self.session_engine.get_state(session_id)
+                except SessionError as e:
+                    return {"error": e.detail, "status_code": e.status_code}
+            return state or {"session_id": session_id, "status": "lobby"}
+
+    async def handle_session_request(
+        self,
+        sid: str,
+        action: Callable[[str], Awaitable[Dict[str, Any]]],
+        host: bool = False,
+    ) -> Dict[str, Any]:
+        """Run a session engine action for the socket's session"""
+        if self.session_engine is None:
+            return {"error": "Game sessions unavailable", "status_code": 503}
+
+        socket_session = await self.sio.get_session(sid)
+        session_id = socket_session.get("session_id")
+        if session_id is None:
+            return {"error": "Join a session first", "status_code": 403}
+        if host and not socket_session.get("host"):
+            return {"error": "Only the session host can do this", "status_code": 403}
+
+        try:
+            return await action(session_id)
+        except SessionError as e:
+            return {"error": e.detail, "status_code": e.status_code}
+        except Exception as e:
+            logger.error(f"Error handling session request for {session_id}: {e}")
+            return {"error": "Internal server error", "status_code": 500}
+
+    async def handle_join_session(
+        self, sid: str, data: Any, host: bool = False
+    ) -> Dict[str, Any]:
+        """Move a socket into a session's rooms; errors are returned in the ack"""
         try:
-            # Convert to JSON string and back to dict to handle datetime serialization
-            json_str = json.dumps(data, cls=DateTimeEncoder, default=str)
-            return json.loads(json_str)
+            request = SessionJoin.model_validate(data or {})
+        except ValidationError as e:
+            return {
+                "error": "Invalid session request",
+                "status_code": 422,
+                "detail": e.errors(include_url=False, include_context=False),
+            }
+
+        if host and request.admin_key != settings.ADMIN_API_KEY:
+            logger.warning(f"Rejected host request from {sid}")
+            return {"error": "Invalid admin API key", "status_code": 401}
+
+        if request.player_id is not None:
+            # Session answers are scored for this player; it must be one of ours
+            player = await player_service.get_player(request.player_id)
+            if player is None or player.session_id != request.session_id:
+                return {
+                    "error": "Player is not in this session",
+                    "status_code": 403,
+                }
+
+        socket_session = await self.sio.get_session(sid)
+        previous = socket_session.get("session_id")
+        if previous is not None and previous != request.session_id:
+            await self.sio.leave_room(sid, self.session_room(previous))
+            await self.sio.leave_room(sid, self.host_room(previous))
+
+        await self.sio.enter_room(sid, self.session_room(request.session_id))
+        if host:
+            await self.sio.enter_room(sid, self.host_room(request.session_id))
+        await self.sio.save_session(
+            sid,
+            {
+                "session_id": request.session_id,
+                "player_id": request.player_id,
+                "host": host,
+            },
+        )
+        logger.info(f"Client {sid} joined session {request.session_id}")
+
+        return await self.get_leaderboard_resync(
+            request.version, request.session_id, request.epoch
+        )
+
+    async def handle_submit_answer(self, data: Any) -> Dict[str, Any]:
+        """Run the shared scoring path; errors are returned in the ack"""
+        if self.answer_handler is None:
+            return {"error": "Answer submission unavailable", "status_code": 503}
+
+        try:
+            answer = AnswerSubmission.model_validate(data or {})
+        except ValidationError as e:
+            return {
+                "error": "Invalid answer submission",
+                "status_code": 422,
+                "detail": e.errors(include_url=False, include_context=False),
+            }
+
+        try:
+            response = await self.answer_handler(answer, "socket")
+        except HTTPException as e:
+            return {"error": e.detail, "status_code": e.status_code}
+        return response.model_dump()
+
+    async def _emit(self, event: str, data: Any, **kwargs):
+        with observe_emit(event):
+            await self.sio.emit(event, data, **kwargs)
+
+    async def emit_to_session(self, session_id: str, event: str, data: Any):
+        """Emit an event to every socket in a session's room"""
+        try:
+            await self._emit(event, data, room=self.session_room(session_id))
         except Exception as e:
-            logger.error(f"Error serializing data: {e}")
-            return data
+            logger.error(f"Error emitting {event}: {e}")
 
-    async def emit_player_joined(self, player_data: Dict[str, Any]):
-        """Emit player joined event to all clients"""
+    async def emit_to_host(self, session_id: str, event: str, data: Any):
+        """Emit an event to a session's host sockets only"""
         try:
-            serialized_data = self._serialize_data(player_data)
-            await self.sio.emit("player_joined", serialized_data)
-            logger.info(f"Emitted player_joined: {serialized_data}")
+            await self._emit(event, data, room=self.host_room(session_id))
+        except Exception as e:
+            logger.error(f"Error emitting {event}: {e}")
+
+    async def emit_to_socket(self, sid: str, event: str, data: Any):
+        try:
+            await self._emit(event, data, to=sid)
+        except Exception as e:
+            logger.error(f"Error emitting {event} to {sid}: {e}")
+
+    async def emit_player_joined(
+        self, player_data: Dict[str, Any], session_id: str = DEFAULT_SESSION_ID
+    ):
+        """Emit player joined event to the session's players"""
+        try:
+            # The server's packet codec handles datetimes, and a broadcast
+            # packet is encoded once for all clients
+            await self._emit(
+                "player_joined", player_data, room=self.session_room(session_id)
+            )
+            logger.debug("Emitted player_joined: %s", player_data)
         except Exception as e:
             logger.error(f"Error emitting player_joined: {e}")
 
-    async def emit_leaderboard_updated(self, leaderboard_data: Dict[str, Any]):
-        """Emit leaderboard updated event to all clients"""
+    async def emit_leaderboard_updated(
+        self, leaderboard_data: Dict[str, Any], session_id: str = DEFAULT_SESSION_ID
+    ):
+        """Emit leaderboard updated event to the session's players"""
         try:
-            serialized_data = self._serialize_data(leaderboard_data)
-            await self.sio.emit("leaderboard_updated", serialized_data)
-            logger.info("Emitted leaderboard_updated")
+            await self._emit(
+                "leaderboard_updated",
+                leaderboard_data,
+                room=self.session_room(session_id),
+            )
+            logger.debug("Emitted leaderboard_updated")
         except Exception as e:
             logger.error(f"Error emitting leaderboard_updated: {e}")
 
-    async def emit_player_answered(self, answer_data: Dict[str, Any]):
-        """Emit player answered event to all clients"""
+    async def emit_player_answered(
+        self, answer_data: Dict[str, Any], session_id: str = DEFAULT_SESSION_ID
+    ):
+        """Emit player answered event to the session's host only"""
         try:
-            serialized_data = self._serialize_data(answer_data)
-            await self.sio.emit("player_answered", serialized_data)
-            logger.info(f"Emitted player_answered: {serialized_data}")
+            await self._emit(
+                "player_answered", answer_data, room=self.host_room(session_id)
+            )
+            logger.debug("Emitted player_answered: %s", answer_data)
         except Exception as e:
             logger.error(f"Error emitting player_answered: {e}")
+
+    async def publish_leaderboard(
+        self, leaderboard_data: Dict[str, Any], session_id: str = DEFAULT_SESSION_ID
+    ):
+        """Version a session's leaderboard and broadcast it as a delta"""
+        leaderboard = leaderboard_data["leaderboard"]
+        if not leaderboard and session_id not in self.leaderboard_versions:
+            # No players and nothing broadcast yet: no history to keep
+            return
+        payload = await self._versions_for(session_id).publish(leaderboard)
+        if payload is not None:
+            await self.emit_leaderboard_updated(payload, session_id)
+
+    async def get_leaderboard_resync(
+        self,
+        last_version: Optional[int],
+        session_id: str = DEFAULT_SESSION_ID,
+        last_epoch: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        leaderboard = None
+        if session_id not in self.leaderboard_versions and self.leaderboard_loader:
+            leaderboard = (await self.leaderboard_loader(session_id))["leaderboard"]
+            if not leaderboard:
+                # Don't keep versions for a session with no players
+                return {
+                    "type": "snapshot",
+                    "version": 0,
+                    "epoch": None,
+                    "leaderboard": [],
+                }
+
+        versions = self._versions_for(session_id)
+        await versions.refresh()
+        if versions.version == 0 and self.leaderboard_loader:
+            # Nothing broadcast yet; establish version 1 for this client
+            if leaderboard is None:
+                leaderboard = (await self.leaderboard_loader(session_id))["leaderboard"]
+            await versions.publish(leaderboard)
+        return versions.resync(last_version, last_epoch)
+
+    def schedule_leaderboard_update(self, session_id: str = DEFAULT_SESSION_ID):
+        """Mark a session's leaderboard dirty; it is broadcast on the next tick"""
+        broadcaster = self._broadcaster_for(session_id)
+        if broadcaster:
+            broadcaster.mark_dirty()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": {
+                session_id: {
+                    "leaderboard_version": versions.version,
+                    "leaderboard_broadcast": (
+                        self.leaderboard_broadcasters[session_id].get_stats()
+                        if session_id in self.leaderboard_broadcasters
+                        else None
+                    ),
+                }
+                for session_id, versions in self.leaderboard_versions.items()
+            },
+            "sessions_evicted": self.sessions_evicted,
+        }
+
+    async def close(self):
+        for broadcaster in self.leaderboard_broadcasters.values():
+            await broadcaster.close()
@@ -1,9 +1,12 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from typing import Dict, List, Optional
 import os
 import logging
 from urllib.parse import urlparse
 import asyncio
+from app.core.observability import MongoCommandMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,45 @@ class Database:
 db = Database()
 
 
+# Indexes every collection needs, ensured at startup by ensure_indexes().
+# Add new query patterns here rather than creating indexes by hand.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "players": [
+        # Leaderboard fallback sort and rank counts
+        IndexModel(
+            [("score", DESCENDING), ("joined_at", ASCENDING)],
+            name="score_desc_joined_at",
+        ),
+        # Per-session leaderboards
+        IndexModel(
+            [("session_id", ASCENDING), ("score", DESCENDING)],
+            name="session_id_score_desc",
+        ),
+    ],
+    "questions": [
+        # Normalized question text; raises DuplicateKeyError on admin writes.
+        # Partial so documents not yet backfilled don't collide on null.
+        IndexModel(
+            [("question_key", ASCENDING)],
+            name="question_key_unique",
+            unique=True,
+            partialFilterExpression={"question_key": {"$exists": True}},
+        ),
+    ],
+    "answers": [
+        # Answer history per player and per question
+        IndexModel(
+            [("player_id", ASCENDING), ("answered_at", DESCENDING)],
+            name="player_id_answered_at",
+        ),
+        IndexModel(
+            [("question_id", ASCENDING), ("answered_at", DESCENDING)],
+            name="question_id_answered_at",
+        ),
+    ],
+}
+
+
 def extract_database_name_from_url(
     mongodb_url: str, default_db: str = "docker_quiz_game"
 ) -> str:
@@ -99,6 +141,7 @@ async def connect_to_mongo():
                 "minPoolSize": 1,  # Minimum connections
                 "maxIdleTimeMS": 30000,  # Max idle time
                 "retryWrites": True,  # Enable retry writes
+                "event_listeners": [MongoCommandMetrics()],  # Command timings
             }
 
             # Additional options for MongoDB Atlas
@@ -121,12 +164,8 @@ async def connect_to_mongo():
 
             # Test the connection with ping
             await db.client.admin.command("ping")
-
-            # Verify database access
-            collections = await db.database.list_collection_names()
             logger.info(f"✅ Successfully connected to MongoDB")
             logger.info(f"📊 Database: {db_name}")
-            logger.info(f"📋 Available collections: {len(collections)}")
             return  # Success, exit retry loop
 
         except Exception as e:
@@ -154,6 +193,63 @@ async def connect_to_mongo():
                 raise ConnectionError(error_msg)
 
 
+async def ensure_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """Create the registered indexes and log any missing or unused ones.
+
+    create_indexes is a no-op for indexes that already exist with the same
+    options. A failure (e.g. duplicate question text blocking the unique
+    index) is logged and leaves that collection's indexes missing rather
+    than stopping startup.
+    """
+    database = get_database()
+    report = {}
+
+    for collection_name, models in INDEXES.items():
+        collection = database[collection_name]
+        try:
+            await collection.create_indexes(models)
+        except OperationFailure as e:
+            logger.error(f"❌ Failed to create indexes on {collection_name}: {e}")
+
+        existing = await collection.index_information()
+        registered = {model.document["name"] for model in models}
+        missing = sorted(registered - existing.keys())
+        unregistered = sorted(existing.keys() - registered - {"_id_"})
+        unused = await _unused_indexes(collection)
+
+        if missing:
+            logger.warning(f"⚠️ {collection_name}: missing indexes {missing}")
+        if unregistered:
+            logger.info(f"📇 {collection_name}: unregistered indexes {unregistered}")
+        if unused:
+            logger.info(
+                f"📇 {collection_name}: indexes unused since server start {unused}"
+            )
+        report[collection_name] = {
+            "missing": missing,
+            "unregistered": unregistered,
+            "unused": unused,
+        }
+
+    logger.info(f"✅ Ensured indexes on {len(INDEXES)} collections")
+    return report
+
+
+async def _unused_indexes(collection) -> List[str]:
+    """Indexes with no recorded accesses, per $indexStats"""
+    try:
+        stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+    except Exception as e:
+        # Needs the indexStats privilege, which restricted users may lack
+        logger.debug(f"$indexStats unavailable for {collection.name}: {e}")
+        return []
+    return sorted(
+        stat["name"]
+        for stat in stats
+        if stat["name"] != "_id_" and not stat.get("accesses", {}).get("ops")
+    )
+
+
 async def close_mongo_connection():
     """Close database connection"""
     if db.client:
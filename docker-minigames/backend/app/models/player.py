@@ -1,8 +1,12 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, Annotated
+from typing import Any, Mapping, Optional, Annotated
 from datetime import datetime
 from bson import ObjectId
 
+# Players that don't pick a game session share the public one
+DEFAULT_SESSION_ID = "public"
+SESSION_ID_PATTERN = r"^[A-Za-z0-9_-]{1,32}$"
+
 
 class PyObjectId(ObjectId):
     @classmethod
@@ -44,6 +48,7 @@ class Player(BaseModel):
     name: str = Field(..., min_length=2, max_length=50)
     score: int = Field(default=0, ge=0)
     joined_at: datetime = Field(default_factory=datetime.utcnow)
+    session_id: str = Field(default=DEFAULT_SESSION_ID, pattern=SESSION_ID_PATTERN)
 
     @field_validator("name")
     @classmethod
@@ -55,6 +60,11 @@ class Player(BaseModel):
 
 class PlayerCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=50)
+    session_id: str = Field(
+        default=DEFAULT_SESSION_ID,
+        pattern=SESSION_ID_PATTERN,
+        description="Game session to join",
+    )
 
     @field_validator("name")
     @classmethod
@@ -69,3 +79,58 @@ class PlayerResponse(BaseModel):
     name: str
     score: int
     joined_at: datetime
+    session_id: str = DEFAULT_SESSION_ID
+
+
+class LeaderboardEntry(PlayerResponse):
+    rank: int = Field(..., ge=1, description="1-based leaderboard position")
+
+
+def session_query(session_id: str) -> dict:
+    """Filter for a session's players; older players belong to the default"""
+    if session_id == DEFAULT_SESSION_ID:
+        return {"session_id": {"$in": [DEFAULT_SESSION_ID, None]}}
+    return {"session_id": session_id}
+
+
+def player_from_document(
+    document: Mapping[str, Any], rank: Optional[int] = None
+) -> PlayerResponse:
+    """Map a player document we wrote to a response without re-validating it.
+
+    Returns a LeaderboardEntry when a rank is given. Validation happens where
+    data enters the API (PlayerCreate) and when FastAPI serializes responses.
+    """
+    fields = {
+        "id": str(document["_id"]),
+        "name": document["name"],
+        "score": document["score"],
+        "joined_at": document["joined_at"],
+        "session_id": document.get("session_id") or DEFAULT_SESSION_ID,
+    }
+    if rank is None:
+        return PlayerResponse.model_construct(**fields)
+    return LeaderboardEntry.model_construct(**fields, rank=rank)
+
+
+class SessionJoin(BaseModel):
+    """Socket.IO request to join a game session's room"""
+
+    session_id: str = Field(default=DEFAULT_SESSION_ID, pattern=SESSION_ID_PATTERN)
+    player_id: Optional[str] = None
+    version: Optional[int] = Field(
+        default=None, description="Last leaderboard version the client holds"
+    )
+    epoch: Optional[str] = Field(
+        default=None, description="Epoch of the client's leaderboard version"
+    )
+    admin_key: Optional[str] = Field(
+        default=None, description="Admin API key, required to host a session"
+    )
+
+    @field_validator("player_id")
+    @classmethod
+    def validate_player_id(cls, v):
+        if v is not None and not ObjectId.is_valid(v):
+            raise ValueError("Invalid ObjectId format")
+        return v
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional
 from bson import ObjectId
 
 
@@ -32,6 +32,11 @@ class PyObjectId(ObjectId):
         return str(self)
 
 
+def normalize_question_text(text: str) -> str:
+    """Key for the unique question index: case- and whitespace-insensitive"""
+    return " ".join(text.lower().split())
+
+
 class Question(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
@@ -82,6 +87,34 @@ class QuestionResponse(BaseModel):
     # Note: correct_answer is deliberately NOT included in response for security
 
 
+def question_from_document(document: Mapping[str, Any]) -> Question:
+    """Map a question document to a Question (with its answer), unvalidated.
+
+    For documents we wrote: admin writes and imports validate on the way in.
+    """
+    return Question.model_construct(
+        id=str(document["_id"]),
+        question=document["question"],
+        options=document["options"],
+        correct_answer=document["correct_answer"],
+        time_limit=document.get("time_limit", 30),
+        max_points=document.get("max_points", 100),
+    )
+
+
+def question_response_from_document(
+    document: Mapping[str, Any], question_id: Optional[str] = None
+) -> QuestionResponse:
+    """Map a question document to its public response, unvalidated"""
+    return QuestionResponse.model_construct(
+        id=question_id or str(document["_id"]),
+        question=document["question"],
+        options=document["options"],
+        time_limit=document.get("time_limit", 30),
+        max_points=document.get("max_points", 100),
+    )
+
+
 class AnswerSubmission(BaseModel):
     player_id: str = Field(..., description="Player ID")
     question_id: str = Field(..., description="Question ID")
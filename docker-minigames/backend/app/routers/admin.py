@@ -1,15 +1,23 @@
 # app/router/admin.py
 
 
-from fastapi import APIRouter, HTTPException, status, Query, Path
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Path, Request
+from pydantic import ValidationError
+from typing import AsyncIterator, Dict, List, Tuple
 import logging
-from app.models.question import Question
+from app.models.question import (
+    Question,
+    normalize_question_text,
+    question_from_document,
+)
 from app.database.connection import get_database
 from app.core.auth import AdminRequired
 from app.core.cache import cache_service
+from app.core.streaming import stream_cursor, wants_ndjson
+from app.services.question_catalog import question_catalog
 from bson import ObjectId
-from pymongo.errors import DuplicateKeyError
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -21,21 +29,12 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 async def get_questions_count():
     """Get total count of questions (Admin only)"""
     try:
-        # Check cache first
-        cache_key = "admin_questions_count"
-        cached_count = await cache_service.get(cache_key)
-
-        if cached_count is not None:
-            return {"total_questions": cached_count}
-
-        db = get_database()
-        questions_collection = db.questions
-
-        total_count = await questions_collection.count_documents({})
-
-        # Cache the result
-        await cache_service.set(
-            cache_key, total_count, ttl=settings.QUESTIONS_CACHE_TTL
+        # Concurrent misses share one load
+        total_count = await cache_service.get_or_load(
+            await cache_service.get_admin_question_count_cache_key(),
+            lambda: get_database().questions.count_documents({}),
+            ttl=settings.QUESTIONS_CACHE_TTL,
+            stale_ttl=settings.QUESTIONS_STALE_TTL,
         )
 
         return {"total_questions": total_count}
@@ -57,12 +56,14 @@ async def create_question(question: Question):
 
         # Prepare question data
         question_data = question.model_dump(exclude={"id"})
+        question_data["question_key"] = normalize_question_text(question.question)
 
         # Insert question
         result = await questions_collection.insert_one(question_data)
 
         if result.inserted_id:
-            # Invalidate cache
+            # Keep answer catalog in sync and invalidate cache
+            question_catalog.upsert(str(result.inserted_id), question_data)
             await cache_service.invalidate_questions_cache()
 
             logger.info(f"✅ Created question with ID: {result.inserted_id}")
@@ -91,49 +92,67 @@ async def create_question(question: Question):
         )
 
 
+async def load_admin_questions(skip: int, limit: int) -> List[dict]:
+    """Load a page of full questions (with answers) from MongoDB"""
+    db = get_database()
+    questions_collection = db.questions
+
+    # Get questions with pagination
+    cursor = questions_collection.find().skip(skip).limit(limit)
+    questions_data = await cursor.to_list(length=limit)
+
+    questions = [
+        question_from_document(q_data).model_dump() for q_data in questions_data
+    ]
+
+    logger.info(f"📋 Retrieved {len(questions)} questions for admin")
+    return questions
+
+
 @router.get("/questions", response_model=List[Question], dependencies=[AdminRequired])
 async def get_all_questions_admin(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of questions to skip"),
     limit: int = Query(50, ge=1, le=100, description="Number of questions to return"),
     include_answers: bool = Query(
         True, description="Include correct answers in response"
     ),
+    stream: bool = Query(
+        False,
+        description="Stream from the database, bypassing the cache "
+        "(implied by Accept: application/x-ndjson)",
+    ),
 ):
     """Get all questions with pagination (Admin only)"""
     try:
-        # Check cache first
-        cache_key = (
-            f"admin_questions:limit_{limit}:skip_{skip}:answers_{include_answers}"
-        )
-        cached_questions = await cache_service.get(cache_key)
-
-        if cached_questions:
-            logger.info(f"📋 Returning {len(cached_questions)} cached admin questions")
-            return cached_questions
-
-        db = get_database()
-        questions_collection = db.questions
-
-        # Get questions with pagination
-        cursor = questions_collection.find().skip(skip).limit(limit)
-        questions_data = await cursor.to_list(length=limit)
-
-        # Convert to Question models
-        questions = []
-        for q_data in questions_data:
-            q_data["id"] = str(q_data["_id"])
-            questions.append(Question(**q_data))
+        ndjson = wants_ndjson(request)
+        if stream or ndjson:
+            batch_size = min(limit, settings.QUESTION_STREAM_BATCH_SIZE)
+            cursor = (
+                get_database()
+                .questions.find({}, batch_size=batch_size)
+                .skip(skip)
+                .limit(limit)
+            )
+            return stream_cursor(
+                cursor,
+                render_admin_question,
+                batch_size,
+                ndjson=ndjson,
+                label="admin questions",
+            )
 
-        # Cache the results
-        await cache_service.set(
+        # Concurrent misses share one load
+        cache_key = await cache_service.get_admin_questions_cache_key(
+            limit, skip, include_answers
+        )
+        return await cache_service.get_or_load(
             cache_key,
-            [q.model_dump() for q in questions],
+            lambda: load_admin_questions(skip, limit),
             ttl=settings.QUESTIONS_CACHE_TTL,
+            stale_ttl=settings.QUESTIONS_STALE_TTL,
         )
 
-        logger.info(f"📋 Retrieved {len(questions)} questions for admin")
-        return questions
-
     except Exception as e:
         logger.error(f"❌ Error retrieving admin questions: {e}")
         raise HTTPException(
@@ -142,6 +161,150 @@ async def get_all_questions_admin(
         )
 
 
+# Per-line errors returned by an import, beyond which they are only counted
+MAX_IMPORT_ERRORS = 20
+
+
+async def ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) for each non-blank line of an NDJSON body"""
+    buffer = b""
+    line_number = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def record_import_error(report: Dict, line_number: int, error: str):
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_IMPORT_ERRORS:
+        report["errors"].append({"line": line_number, "error": error})
+
+
+async def write_import_chunk(chunk: List[Tuple[int, Question]], report: Dict):
+    """Write validated questions with one unordered bulk_write.
+
+    Questions with an `id` replace (or create) that document; the rest are
+    inserted. Failed writes, e.g. duplicate question text, don't stop the
+    others.
+    """
+    requests = []
+    for _, question in chunk:
+        document = question.model_dump(exclude={"id"})
+        document["question_key"] = normalize_question_text(question.question)
+        if question.id:
+            requests.append(
+                ReplaceOne({"_id": ObjectId(question.id)}, document, upsert=True)
+            )
+        else:
+            requests.append(InsertOne(document))
+
+    try:
+        result = await get_database().questions.bulk_write(requests, ordered=False)
+        details = result.bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+        for error in details["writeErrors"]:
+            line_number = chunk[error["index"]][0]
+            if error["code"] == 11000:
+                report["duplicates"] += 1
+                record_import_error(
+                    report, line_number, "Question with similar content already exists"
+                )
+            else:
+                record_import_error(report, line_number, error["errmsg"])
+
+    report["inserted"] += details["nInserted"] + details["nUpserted"]
+    report["updated"] += details["nModified"]
+
+
+@router.post("/questions/import", response_model=dict, dependencies=[AdminRequired])
+async def import_questions(request: Request):
+    """Bulk import questions from an NDJSON body (Admin only)
+
+    One question per line, in the shape returned by the export. Lines are
+    validated and written in chunks; caches are invalidated once at the end.
+    """
+    chunk_size = settings.QUESTION_IMPORT_CHUNK_SIZE
+    report = {
+        "received": 0,
+        "inserted": 0,
+        "updated": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "errors": [],
+    }
+
+    try:
+        chunk: List[Tuple[int, Question]] = []
+        async for line_number, line in ndjson_lines(request):
+            report["received"] += 1
+            try:
+                question = Question.model_validate_json(line)
+            except ValidationError as e:
+                record_import_error(
+                    report,
+                    line_number,
+                    "; ".join(error["msg"] for error in e.errors()),
+                )
+                continue
+            if question.id is not None and not ObjectId.is_valid(question.id):
+                record_import_error(report, line_number, "Invalid question ID format")
+                continue
+
+            chunk.append((line_number, question))
+            if len(chunk) >= chunk_size:
+                await write_import_chunk(chunk, report)
+                chunk = []
+
+        if chunk:
+            await write_import_chunk(chunk, report)
+
+    except Exception as e:
+        logger.error(f"❌ Error importing questions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while importing questions",
+        )
+    finally:
+        # Also covers chunks written before a failure
+        if report["inserted"] or report["updated"]:
+            await question_catalog.load()
+            await cache_service.invalidate_questions_cache()
+
+    logger.info(
+        f"📥 Imported questions: {report['inserted']} inserted, "
+        f"{report['updated']} updated, {report['failed']} failed"
+    )
+    return {"status": "success" if not report["failed"] else "partial", **report}
+
+
+def render_admin_question(question_data) -> bytes:
+    """Admin list item JSON, keyed like the response_model (`_id`)"""
+    return question_from_document(question_data).model_dump_json(by_alias=True).encode()
+
+
+@router.get("/questions/export", dependencies=[AdminRequired])
+async def export_questions():
+    """Stream every question, with answers, as NDJSON (Admin only)"""
+    batch_size = settings.QUESTION_STREAM_BATCH_SIZE
+    return stream_cursor(
+        get_database().questions.find({}, batch_size=batch_size),
+        lambda question_data: question_from_document(question_data)
+        .model_dump_json()
+        .encode(),
+        batch_size,
+        ndjson=True,
+        label="exported questions",
+        headers={"Content-Disposition": 'attachment; filename="questions.ndjson"'},
+    )
+
+
 @router.get(
     "/questions/{question_id}", response_model=Question, dependencies=[AdminRequired]
 )
@@ -155,12 +318,12 @@ async def get_question_admin(question_id: str = Path(..., description="Question
             )
 
         # Check cache first
-        cache_key = f"admin_question:{question_id}"
+        cache_key = await cache_service.get_admin_question_cache_key(question_id)
         cached_question = await cache_service.get(cache_key)
 
         if cached_question:
             logger.info(f"📄 Returning cached admin question: {question_id}")
-            return Question(**cached_question)
+            return Question.model_construct(**cached_question)
 
         db = get_database()
         questions_collection = db.questions
@@ -174,8 +337,7 @@ async def get_question_admin(question_id: str = Path(..., description="Question
                 status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
             )
 
-        question_data["id"] = str(question_data["_id"])
-        question = Question(**question_data)
+        question = question_from_document(question_data)
 
         # Cache the result
         await cache_service.set(
@@ -214,6 +376,7 @@ async def update_question(
 
         # Prepare update data (exclude id field)
         update_data = question_update.model_dump(exclude={"id"})
+        update_data["question_key"] = normalize_question_text(question_update.question)
 
         # Update question
         result = await questions_collection.update_one(
@@ -226,9 +389,9 @@ async def update_question(
             )
 
         if result.modified_count > 0:
-            # Invalidate cache
+            # Keep answer catalog in sync and invalidate cache
+            question_catalog.upsert(question_id, update_data)
             await cache_service.invalidate_questions_cache()
-            await cache_service.delete(f"admin_question:{question_id}")
 
             logger.info(f"✅ Updated question: {question_id}")
 
@@ -246,6 +409,11 @@ async def update_question(
 
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Question with similar content already exists",
+        )
     except Exception as e:
         logger.error(f"❌ Error updating question {question_id}: {e}")
         raise HTTPException(
@@ -282,9 +450,9 @@ async def delete_question(question_id: str = Path(..., description="Question ID"
         result = await questions_collection.delete_one({"_id": ObjectId(question_id)})
 
         if result.deleted_count > 0:
-            # Invalidate cache
+            # Keep answer catalog in sync and invalidate cache
+            question_catalog.remove(question_id)
             await cache_service.invalidate_questions_cache()
-            await cache_service.delete(f"admin_question:{question_id}")
 
             logger.info(f"🗑️ Deleted question: {question_id}")
 
@@ -313,11 +481,11 @@ async def delete_question(question_id: str = Path(..., description="Question ID"
 async def invalidate_cache():
     """Manually invalidate all question-related cache (Admin only)"""
     try:
-        deleted_count = await cache_service.invalidate_questions_cache()
+        generation = await cache_service.invalidate_questions_cache()
 
         return {
             "message": "Cache invalidated successfully",
-            "deleted_entries": deleted_count,
+            "generation": generation,
             "status": "success",
         }
     except Exception as e:
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.models.player import PlayerCreate, PlayerResponse
+from app.models.player import DEFAULT_SESSION_ID, PlayerCreate, PlayerResponse
 from app.models.question import AnswerSubmission, AnswerResponse
 from app.services.player_service import player_service
 from app.services.question_service import question_service
+from app.services.answer_log_service import answer_log_service
+from app.core.observability import answer_duration
 import logging
-from datetime import datetime
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,6 +20,13 @@ def set_websocket_manager(manager):
     websocket_manager = manager
 
 
+async def get_leaderboard_payload(session_id: str = DEFAULT_SESSION_ID):
+    """Build the leaderboard_updated payload for a game session"""
+    leaderboard = await player_service.get_leaderboard(session_id=session_id)
+    # JSON mode keeps entries comparable with the versions stored in Redis
+    return {"leaderboard": [player.model_dump(mode="json") for player in leaderboard]}
+
+
 @router.post("/join", response_model=PlayerResponse)
 async def join_game(player_data: PlayerCreate):
     """Join the game by creating a new player"""
@@ -35,7 +44,8 @@ async def join_game(player_data: PlayerCreate):
         # Emit player joined event
         if websocket_manager:
             await websocket_manager.emit_player_joined(
-                {"player_id": player.id, "name": player.name, "score": player.score}
+                {"player_id": player.id, "name": player.name, "score": player.score},
+                session_id=player.session_id,
             )
 
         return player
@@ -46,24 +56,26 @@ async def join_game(player_data: PlayerCreate):
         raise HTTPException(status_code=500, detail="Failed to join game")
 
 
-@router.post("/answer", response_model=AnswerResponse)
-async def submit_answer(answer: AnswerSubmission):
-    """Submit an answer for a question with speed-based scoring"""
+async def process_answer(
+    answer: AnswerSubmission, channel: str = "http"
+) -> AnswerResponse:
+    """Score an answer; shared by the HTTP endpoint and the Socket.IO event"""
     try:
+        started = time.perf_counter()
         logger.info(
-            f"Processing answer - Player: {answer.player_id}, "
+            f"Processing answer via {channel} - Player: {answer.player_id}, "
             f"Question: {answer.question_id}, Selected: {answer.selected_option}, "
             f"Time: {answer.time_taken}s"
         )
 
         # Verify answer and calculate score based on speed
-        is_correct, points_earned, speed_bonus, question = (
+        is_correct, points_earned, speed_bonus, answer_key = (
             await question_service.verify_answer_and_calculate_score(
                 answer.question_id, answer.selected_option, answer.time_taken
             )
         )
 
-        if question is None:
+        if answer_key is None:
             logger.error(f"Question not found: {answer.question_id}")
             raise HTTPException(status_code=404, detail="Question not found")
 
@@ -76,8 +88,17 @@ async def submit_answer(answer: AnswerSubmission):
             logger.error(f"Player not found: {answer.player_id}")
             raise HTTPException(status_code=404, detail="Player not found")
 
-        # Get current leaderboard
-        leaderboard = await player_service.get_leaderboard()
+        # Persisted asynchronously by the answer log's write-behind buffer
+        answer_log_service.record(
+            answer.player_id,
+            answer.question_id,
+            answer.selected_option,
+            answer.time_taken,
+            points_earned,
+            speed_bonus,
+            is_correct,
+            channel,
+        )
 
         # Emit events with enhanced data
         if websocket_manager:
@@ -91,21 +112,12 @@ async def submit_answer(answer: AnswerSubmission):
                         "speed_bonus": speed_bonus,
                         "time_taken": answer.time_taken,
                         "new_score": updated_player.score,
-                    }
+                    },
+                    session_id=updated_player.session_id,
                 )
 
-                # Convert PlayerResponse objects to dictionaries with proper datetime handling
-                leaderboard_data = []
-                for player in leaderboard:
-                    player_dict = player.model_dump()
-                    # Ensure datetime is properly serialized
-                    if isinstance(player_dict.get("joined_at"), datetime):
-                        player_dict["joined_at"] = player_dict["joined_at"].isoformat()
-                    leaderboard_data.append(player_dict)
-
-                await websocket_manager.emit_leaderboard_updated(
-                    {"leaderboard": leaderboard_data}
-                )
+                # Leaderboard broadcasts are coalesced per tick
+                websocket_manager.schedule_leaderboard_update(updated_player.session_id)
                 logger.info("WebSocket events emitted successfully")
             except Exception as ws_error:
                 logger.error(f"WebSocket error: {ws_error}")
@@ -119,11 +131,15 @@ async def submit_answer(answer: AnswerSubmission):
             speed_bonus=speed_bonus,
             message=f"{'Correct!' if is_correct else 'Incorrect.'} You earned {points_earned} points.",
             correct_answer=(
-                question.correct_answer if not is_correct else None
+                answer_key.correct_answer if not is_correct else None
             ),  # Only show if wrong
         )
 
-        logger.info(f"Answer processed successfully: {response}")
+        elapsed = time.perf_counter() - started
+        answer_duration.labels(channel=channel).observe(elapsed)
+        logger.info(
+            f"Answer processed via {channel} in {elapsed * 1000:.1f}ms: {response}"
+        )
         return response
 
     except HTTPException:
@@ -133,3 +149,9 @@ async def submit_answer(answer: AnswerSubmission):
         raise HTTPException(
             status_code=500, detail=f"Failed to submit answer: {str(e)}"
         )
+
+
+@router.post("/answer", response_model=AnswerResponse)
+async def submit_answer(answer: AnswerSubmission):
+    """Submit an answer for a question with speed-based scoring"""
+    return await process_answer(answer)
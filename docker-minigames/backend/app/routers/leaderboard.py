@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Path, Query
 from typing import List
-from app.models.player import PlayerResponse
+from app.models.player import PlayerResponse, LeaderboardEntry
 from app.services.player_service import player_service
 
 router = APIRouter()
@@ -15,3 +15,30 @@ async def get_leaderboard():
     except Exception as e:
         print(f"Error in get_leaderboard: {e}")
         raise HTTPException(status_code=500, detail="Failed to get leaderboard")
+
+
+@router.get("/leaderboard/rank/{player_id}", response_model=LeaderboardEntry)
+async def get_player_rank(player_id: str = Path(..., description="Player ID")):
+    """Get a player's current rank"""
+    try:
+        entry = await player_service.get_player_rank(player_id)
+    except Exception as e:
+        print(f"Error in get_player_rank: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get player rank")
+
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return entry
+
+
+@router.get("/leaderboard/around/{player_id}", response_model=List[LeaderboardEntry])
+async def get_players_around(
+    player_id: str = Path(..., description="Player ID"),
+    radius: int = Query(5, ge=1, le=25, description="Places above and below"),
+):
+    """Get the players ranked around a player"""
+    try:
+        return await player_service.get_players_around(player_id, radius)
+    except Exception as e:
+        print(f"Error in get_players_around: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get leaderboard")
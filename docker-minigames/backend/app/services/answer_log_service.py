@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.database.connection import get_database
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class AnswerLogService:
+    """Append-only log of scored answers with batched write-behind.
+
+    Answers are buffered in memory and written to the `answers` collection
+    with insert_many when the buffer reaches ANSWER_LOG_FLUSH_SIZE or every
+    ANSWER_LOG_FLUSH_INTERVAL_MS. The buffer is capped at
+    ANSWER_LOG_MAX_BUFFER events; beyond that the oldest events are dropped
+    so a slow or unavailable database can't exhaust memory.
+    """
+
+    def __init__(self):
+        self.collection_name = "answers"
+        self.flush_size = settings.ANSWER_LOG_FLUSH_SIZE
+        self.flush_interval = settings.ANSWER_LOG_FLUSH_INTERVAL_MS / 1000
+        self.max_buffer = settings.ANSWER_LOG_MAX_BUFFER
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._size_flush: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+
+    @property
+    def collection(self):
+        return get_database()[self.collection_name]
+
+    def record(
+        self,
+        player_id: str,
+        question_id: str,
+        selected_option: int,
+        time_taken: float,
+        points_earned: int,
+        speed_bonus: int,
+        is_correct: bool,
+        channel: str = "http",
+    ):
+        """Queue an answer event; it is persisted by the next flush"""
+        self._buffer.append(
+            {
+                "player_id": ObjectId(player_id),
+                "question_id": ObjectId(question_id),
+                "selected_option": selected_option,
+                "time_taken": time_taken,
+                "points_earned": points_earned,
+                "speed_bonus": speed_bonus,
+                "is_correct": is_correct,
+                "channel": channel,
+                "answered_at": datetime.utcnow(),
+            }
+        )
+        self.recorded += 1
+        self._enforce_bound()
+
+        if len(self._buffer) >= self.flush_size and (
+            self._size_flush is None or self._size_flush.done()
+        ):
+            self._size_flush = asyncio.create_task(self.flush())
+
+    def _enforce_bound(self):
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning(f"⚠️ Answer log buffer full, dropped {overflow} events")
+
+    async def flush(self) -> int:
+        """Write all buffered events with a single unordered insert_many"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+
+            batch, self._buffer = self._buffer, []
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Events keep the _id insert_many gave them, so a duplicate
+                # key means an earlier attempt already wrote that event
+                failed = [
+                    batch[error["index"]]
+                    for error in e.details.get("writeErrors", [])
+                    if error.get("code") != DUPLICATE_KEY_ERROR
+                ]
+                written = len(batch) - len(failed)
+                if failed:
+                    logger.error(
+                        f"❌ Error flushing answer events: {len(failed)} of "
+                        f"{len(batch)} failed: {e}"
+                    )
+                else:
+                    logger.info(
+                        f"📝 Answer events already written by an earlier flush: "
+                        f"{len(e.details.get('writeErrors', []))}"
+                    )
+                self._requeue(failed)
+                self.flushed += written
+                return written
+            except Exception as e:
+                logger.error(f"❌ Error flushing {len(batch)} answer events: {e}")
+                self._requeue(batch)
+                return 0
+
+            self.flushed += len(batch)
+            return len(batch)
+
+    def _requeue(self, events: List[Dict[str, Any]]):
+        """Put events back in front of newer ones; the bound still applies"""
+        self._buffer = events + self._buffer
+        self._enforce_bound()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Shielded so stopping the loop never abandons a batch mid-write
+            await asyncio.shield(self.flush())
+
+    def start(self):
+        """Start the time-based flusher"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the flusher and persist whatever is still buffered"""
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+
+        # In-flight flushes finish first since they hold the flush lock
+        flushed = await self.flush()
+        if flushed:
+            logger.info(f"📝 Flushed {flushed} answer events on shutdown")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "pending": len(self._buffer),
+        }
+
+
+answer_log_service = AnswerLogService()
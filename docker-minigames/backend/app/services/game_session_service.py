@@ -0,0 +1,863 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from bson import ObjectId
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.services.answer_log_service import answer_log_service
+from app.services.player_service import player_service
+from app.services.question_catalog import question_catalog
+from app.services.question_service import question_service
+
+logger = logging.getLogger(__name__)
+
+LOBBY = "lobby"
+QUESTION_OPEN = "question_open"
+QUESTION_CLOSED = "question_closed"
+RESULTS = "results"
+
+# Extend the lease only if this worker still holds it
+RENEW_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Mark a round scored unless it (or a later one) already is
+CLAIM_ROUND_SCRIPT = """
+local scored = tonumber(redis.call("get", KEYS[1]) or "-1")
+if scored >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+return 1
+"""
+
+# Give the lease up only if this worker still holds it
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SessionError(Exception):
+    """A session request that can't be honoured in the current state"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass(slots=True)
+class SessionAnswer:
+    selected_option: int
+    time_taken: float
+    sid: Optional[str] = None
+
+
+@dataclass(slots=True)
+class GameSession:
+    """State of one server-driven game.
+
+    `opened_at` is on the monotonic clock and is what answers are timed
+    against; the `*_epoch` fields are wall-clock times shared with clients
+    and used to resume the session from its checkpoint.
+    """
+
+    session_id: str
+    question_ids: List[str]
+    status: str = LOBBY
+    round: int = -1
+    opened_at: float = 0.0
+    opened_at_epoch: float = 0.0
+    closes_at_epoch: float = 0.0
+    next_round_at_epoch: float = 0.0
+    answers: Dict[str, SessionAnswer] = field(default_factory=dict)
+
+    @property
+    def question_id(self) -> Optional[str]:
+        if 0 <= self.round < len(self.question_ids):
+            return self.question_ids[self.round]
+        return None
+
+    @property
+    def is_last_round(self) -> bool:
+        return self.round >= len(self.question_ids) - 1
+
+    def public_state(self) -> Dict[str, Any]:
+        state = {
+            "session_id": self.session_id,
+            "status": self.status,
+            "round": self.round,
+            "rounds": len(self.question_ids),
+            "server_time": int(time.time() * 1000),
+        }
+        if self.status == QUESTION_OPEN:
+            state.update(
+                question=question_catalog.public_question(self.question_id),
+                starts_at=int(self.opened_at_epoch * 1000),
+                closes_at=int(self.closes_at_epoch * 1000),
+            )
+        return state
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "question_ids": self.question_ids,
+            "status": self.status,
+            "round": self.round,
+            "opened_at_epoch": self.opened_at_epoch,
+            "closes_at_epoch": self.closes_at_epoch,
+            "next_round_at_epoch": self.next_round_at_epoch,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any]) -> "GameSession":
+        session = cls(
+            session_id=data["session_id"],
+            question_ids=data["question_ids"],
+            status=data["status"],
+            round=data["round"],
+            opened_at_epoch=data["opened_at_epoch"],
+            closes_at_epoch=data["closes_at_epoch"],
+            next_round_at_epoch=data.get("next_round_at_epoch", 0.0),
+        )
+        # Re-anchor the round start on this process's monotonic clock
+        session.opened_at = time.monotonic() - (time.time() - session.opened_at_epoch)
+        return session
+
+
+class GameSessionService:
+    """Server-driven game sessions: lobby -> question open -> question
+    closed -> ... -> results.
+
+    The server pushes each question to the session room with a short lead
+    so every client reveals it at the same instant, times answers on its
+    own monotonic clock and closes the round when the question's time
+    limit runs out. A round's answers are scored together when it closes,
+    with one bulk write. Session state is checkpointed to Redis so a
+    restarted server picks running sessions back up.
+
+    With several workers, each running session is driven by the worker
+    holding its Redis lease. That worker renews the lease while it is
+    alive; the others forward session actions to it over pub/sub and
+    adopt the session only once the lease has expired.
+    """
+
+    # Per-session keys put the session id last, so no id can collide with
+    # another key
+    CHECKPOINT_PREFIX = "game_session:state:"
+    ANSWERS_PREFIX = "game_session:answers:"
+    LEASE_PREFIX = "game_session:owner:"
+    SCORED_PREFIX = "game_session:scored:"
+    RUNNING_KEY = "game_sessions:running"
+    COMMAND_CHANNEL_PREFIX = "game_session_commands:"
+    REPLY_PREFIX = "game_session_reply:"
+
+    def __init__(self):
+        self.sessions: Dict[str, GameSession] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        # Sessions whose lease this worker holds
+        self._leases: Set[str] = set()
+        self._background: List[asyncio.Task] = []
+        self._command_tasks: Set[asyncio.Task] = set()
+        self._commands = {
+            "start": self._start,
+            "answer": self._submit_answer,
+            "close": self._close_now,
+            "state": self._get_state,
+        }
+        self.websocket_manager = None
+        self.rounds_closed = 0
+        self.answers_scored = 0
+        self.forwarded = 0
+
+    def set_websocket_manager(self, manager):
+        self.websocket_manager = manager
+
+    @property
+    def instance_id(self) -> str:
+        return cache_service.instance_id
+
+    @classmethod
+    def checkpoint_key(cls, session_id: str) -> str:
+        return f"{cls.CHECKPOINT_PREFIX}{session_id}"
+
+    @classmethod
+    def answers_key(cls, session_id: str) -> str:
+        return f"{cls.ANSWERS_PREFIX}{session_id}"
+
+    @classmethod
+    def lease_key(cls, session_id: str) -> str:
+        return f"{cls.LEASE_PREFIX}{session_id}"
+
+    @classmethod
+    def scored_key(cls, session_id: str) -> str:
+        return f"{cls.SCORED_PREFIX}{session_id}"
+
+    @classmethod
+    def command_channel(cls, instance_id: str) -> str:
+        return f"{cls.COMMAND_CHANNEL_PREFIX}{instance_id}"
+
+    async def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await self._route(session_id, "state", {})
+
+    async def start(
+        self, session_id: str, question_count: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Start a new game in a session and push its first question"""
+        return await self._route(
+            session_id, "start", {"question_count": question_count}
+        )
+
+    async def submit_answer(
+        self,
+        session_id: str,
+        player_id: str,
+        selected_option: int,
+        sid: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Accept an answer for the open round, timed by the server"""
+        return await self._route(
+            session_id,
+            "answer",
+            {
+                "player_id": player_id,
+                "selected_option": selected_option,
+                "sid": sid,
+                # Forwarded answers are timed from when this worker got them
+                "received_at_epoch": time.time(),
+            },
+            {"received_at": time.monotonic()},
+        )
+
+    async def close_now(self, session_id: str) -> Dict[str, Any]:
+        """Close the open round early (host request)"""
+        return await self._route(session_id, "close", {})
+
+    async def _get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session = self.sessions.get(session_id)
+        return session.public_state() if session else None
+
+    async def _start(
+        self, session_id: str, question_count: Optional[int] = None
+    ) -> Dict[str, Any]:
+        session = self.sessions.get(session_id)
+        if session is not None and session.status != RESULTS:
+            raise SessionError(409, "Session is already running")
+
+        question_ids = question_catalog.sample_ids(
+            question_count or settings.SESSION_QUESTION_COUNT
+        )
+        if not question_ids:
+            raise SessionError(404, "No questions available")
+
+        owner = await self._claim_lease(session_id)
+        if owner is not None:
+            # Another worker took the session since this request was routed
+            return await self._forward(
+                owner, session_id, "start", {"question_count": question_count}
+            )
+
+        if self.redis is not None:
+            # A new game scores its rounds from 0 again
+            await self.redis.delete(self.scored_key(session_id))
+        session = GameSession(session_id=session_id, question_ids=question_ids)
+        self.sessions[session_id] = session
+        logger.info(f"🎮 Session {session_id} started with {len(question_ids)} rounds")
+        await self.open_round(session, 0)
+        return session.public_state()
+
+    async def open_round(self, session: GameSession, index: int):
+        """Push a question to the room; it opens after the round lead time"""
+        session.round = index
+        session.status = QUESTION_OPEN
+        session.answers = {}
+
+        answer_key = await question_catalog.get(session.question_id)
+        time_limit = answer_key.time_limit if answer_key else 30
+        lead = settings.SESSION_ROUND_LEAD_MS / 1000
+
+        session.opened_at = time.monotonic() + lead
+        session.opened_at_epoch = time.time() + lead
+        session.closes_at_epoch = session.opened_at_epoch + time_limit
+        session.next_round_at_epoch = 0.0
+
+        await self._checkpoint(session, reset_answers=True)
+        self._schedule(session, lead + time_limit, self.close_round)
+        await self._emit(session.session_id, "round_started", session.public_state())
+
+    async def _submit_answer(
+        self,
+        session_id: str,
+        player_id: str,
+        selected_option: int,
+        sid: Optional[str] = None,
+        received_at: Optional[float] = None,
+        received_at_epoch: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        if received_at is None:
+            received_at = time.monotonic()
+            if received_at_epoch is not None:
+                # Re-anchor the forwarding worker's receipt time on this
+                # process's monotonic clock; a forward never takes longer
+                # than its timeout, which bounds clock skew between hosts
+                forward_delay = min(
+                    max(time.time() - received_at_epoch, 0),
+                    settings.SESSION_FORWARD_TIMEOUT_MS / 1000,
+                )
+                received_at -= forward_delay
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionError(404, "Session not found")
+        if session.status != QUESTION_OPEN:
+            raise SessionError(409, "Round is closed")
+
+        time_taken = received_at - session.opened_at
+        if time_taken < 0:
+            raise SessionError(425, "Round has not started yet")
+        if received_at > session.opened_at + (
+            session.closes_at_epoch - session.opened_at_epoch
+        ):
+            raise SessionError(409, "Round is closed")
+        if player_id in session.answers:
+            raise SessionError(409, "Already answered this round")
+
+        answer = SessionAnswer(selected_option, round(time_taken, 3), sid)
+        session.answers[player_id] = answer
+        await self._checkpoint_answer(session, player_id, answer)
+        return {
+            "accepted": True,
+            "round": session.round,
+            "time_taken": answer.time_taken,
+        }
+
+    async def close_round(self, session: GameSession):
+        """Close the open round, score its answers and schedule the next one"""
+        if session.status != QUESTION_OPEN:
+            return
+        session.status = QUESTION_CLOSED
+        if not await self._claim_round(session):
+            # Another worker took the session over and closed this round
+            logger.warning(
+                f"⚠️ Round {session.round} of session {session.session_id} "
+                f"was already scored elsewhere; handing the session over"
+            )
+            await self._release_lease(session.session_id)
+            self._drop(session.session_id)
+            return
+        # Checkpoint the close before any points are written, so a worker
+        # resuming the session never scores the round again
+        await self._checkpoint(session)
+
+        question_id = session.question_id
+        answer_key = None
+        results = {}
+        try:
+            answer_key = await question_catalog.get(question_id)
+            await self._score_round(session, question_id, answer_key, results)
+        except Exception as e:
+            # Scoring errors must not leave the session stuck between rounds
+            logger.error(
+                f"❌ Error scoring round {session.round} of session "
+                f"{session.session_id}: {e}"
+            )
+
+        self.rounds_closed += 1
+        self.answers_scored += len(results)
+
+        if not session.is_last_round:
+            session.next_round_at_epoch = (
+                time.time() + settings.SESSION_INTERMISSION_SECONDS
+            )
+        await self._checkpoint(session)
+
+        await self._emit(
+            session.session_id,
+            "round_closed",
+            {
+                "session_id": session.session_id,
+                "round": session.round,
+                "question_id": question_id,
+                "correct_answer": answer_key.correct_answer if answer_key else None,
+                "answered": len(results),
+                "next_round_at": int(session.next_round_at_epoch * 1000) or None,
+            },
+        )
+        if self.websocket_manager:
+            for player_id, result in results.items():
+                sid = session.answers[player_id].sid
+                if sid:
+                    await self.websocket_manager.emit_to_socket(
+                        sid, "round_result", {"round": session.round, **result}
+                    )
+            await self.websocket_manager.emit_to_host(
+                session.session_id,
+                "round_summary",
+                {"round": session.round, "results": list(results.values())},
+            )
+            self.websocket_manager.schedule_leaderboard_update(session.session_id)
+
+        if session.is_last_round:
+            await self.finish(session)
+        else:
+            self._schedule(
+                session, settings.SESSION_INTERMISSION_SECONDS, self._open_next_round
+            )
+
+    async def _score_round(
+        self,
+        session: GameSession,
+        question_id: str,
+        answer_key,
+        results: Dict[str, Dict[str, Any]],
+    ):
+        """Score a closed round's answers into `results` and persist them"""
+        for player_id, answer in session.answers.items():
+            if not ObjectId.is_valid(player_id):
+                logger.warning(f"Skipping answer from invalid player ID {player_id!r}")
+                continue
+            is_correct = (
+                answer_key is not None
+                and answer_key.correct_answer == answer.selected_option
+            )
+            points_earned, speed_bonus = (
+                question_service.calculate_score(
+                    is_correct,
+                    answer.time_taken,
+                    answer_key.max_points,
+                    answer_key.time_limit,
+                )
+                if answer_key
+                else (0, 0)
+            )
+            results[player_id] = {
+                "player_id": player_id,
+                "is_correct": is_correct,
+                "points_earned": points_earned,
+                "speed_bonus": speed_bonus,
+                "time_taken": answer.time_taken,
+                "new_score": None,
+            }
+
+        # One bulk write and one leaderboard pipeline for the whole round
+        players = await player_service.update_player_scores(
+            [
+                (
+                    player_id,
+                    result["points_earned"],
+                    result["time_taken"],
+                    result["is_correct"],
+                )
+                for player_id, result in results.items()
+            ]
+        )
+        for player_id, result in results.items():
+            player = players.get(player_id)
+            result["new_score"] = player.score if player else None
+            answer_log_service.record(
+                player_id,
+                question_id,
+                session.answers[player_id].selected_option,
+                result["time_taken"],
+                result["points_earned"],
+                result["speed_bonus"],
+                result["is_correct"],
+                "session",
+            )
+
+    async def _claim_round(self, session: GameSession) -> bool:
+        """Mark the round scored; False if some worker already scored it"""
+        if self.redis is None:
+            return True
+        try:
+            return bool(
+                await self.redis.eval(
+                    CLAIM_ROUND_SCRIPT,
+                    1,
+                    self.scored_key(session.session_id),
+                    session.round,
+                    settings.SESSION_CHECKPOINT_TTL,
+                )
+            )
+        except Exception as e:
+            # Without Redis no other worker can resume the session either
+            logger.error(
+                f"❌ Error claiming round of session {session.session_id}: {e}"
+            )
+            return True
+
+    async def _open_next_round(self, session: GameSession):
+        await self.open_round(session, session.round + 1)
+
+    async def finish(self, session: GameSession):
+        session.status = RESULTS
+        await self._checkpoint(session)
+        leaderboard = await player_service.get_leaderboard(
+            session_id=session.session_id
+        )
+        await self._emit(
+            session.session_id,
+            "session_results",
+            {
+                "session_id": session.session_id,
+                "rounds": len(session.question_ids),
+                "leaderboard": [
+                    player.model_dump(mode="json") for player in leaderboard
+                ],
+            },
+        )
+        # Any worker may start the session's next game
+        await self._release_lease(session.session_id)
+        logger.info(f"🏁 Session {session.session_id} finished")
+
+    async def _close_now(self, session_id: str) -> Dict[str, Any]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionError(404, "Session not found")
+        if session.status != QUESTION_OPEN:
+            raise SessionError(409, "Round is closed")
+        self._cancel_timer(session_id)
+        await self.close_round(session)
+        return session.public_state()
+
+    def _schedule(self, session: GameSession, delay: float, step):
+        self._cancel_timer(session.session_id)
+        self._timers[session.session_id] = asyncio.create_task(
+            self._run_after(session, max(delay, 0), step)
+        )
+
+    async def _run_after(self, session: GameSession, delay: float, step):
+        await asyncio.sleep(delay)
+        # Drop our own handle first so the step can schedule the next one
+        self._timers.pop(session.session_id, None)
+        try:
+            await step(session)
+        except Exception as e:
+            logger.error(f"❌ Error advancing session {session.session_id}: {e}")
+
+    def _cancel_timer(self, session_id: str):
+        timer = self._timers.pop(session_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def _emit(self, session_id: str, event: str, data: Dict[str, Any]):
+        if self.websocket_manager:
+            await self.websocket_manager.emit_to_session(session_id, event, data)
+
+    @property
+    def redis(self):
+        return cache_service.redis_client if cache_service.is_connected else None
+
+    async def _route(
+        self,
+        session_id: str,
+        command: str,
+        args: Dict[str, Any],
+        local_args: Optional[Dict[str, Any]] = None,
+    ):
+        """Run a session command here, or on the worker driving the session"""
+        owner = await self._owner_of(session_id)
+        if owner is None:
+            return await self._commands[command](
+                session_id, **args, **(local_args or {})
+            )
+        return await self._forward(owner, session_id, command, args)
+
+    async def _owner_of(self, session_id: str) -> Optional[str]:
+        """The other worker holding the session's lease, if there is one"""
+        if self.redis is None or session_id in self._leases:
+            return None
+        try:
+            owner = await self.redis.get(self.lease_key(session_id))
+        except Exception as e:
+            logger.error(f"❌ Error looking up owner of session {session_id}: {e}")
+            return None
+        if owner is None or owner.decode() == self.instance_id:
+            return None
+        return owner.decode()
+
+    async def _claim_lease(self, session_id: str) -> Optional[str]:
+        """Take the session's lease; returns the other worker holding it instead"""
+        if self.redis is None:
+            return None
+        key = self.lease_key(session_id)
+        if await self.redis.set(
+            key, self.instance_id, nx=True, px=settings.SESSION_LEASE_MS
+        ):
+            self._leases.add(session_id)
+            return None
+        owner = await self.redis.get(key)
+        if owner is None:
+            raise SessionError(409, "Session is changing workers, try again")
+        if owner.decode() == self.instance_id:
+            self._leases.add(session_id)
+            return None
+        return owner.decode()
+
+    async def _release_lease(self, session_id: str):
+        if session_id not in self._leases:
+            return
+        self._leases.discard(session_id)
+        try:
+            await self.redis.eval(
+                RELEASE_LEASE_SCRIPT, 1, self.lease_key(session_id), self.instance_id
+            )
+        except Exception as e:
+            logger.error(f"❌ Error releasing lease of session {session_id}: {e}")
+
+    async def _renew_leases(self):
+        """Extend this worker's leases and drop sessions it has lost"""
+        session_ids = list(self._leases)
+        if not session_ids:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.eval(
+                RENEW_LEASE_SCRIPT,
+                1,
+                self.lease_key(session_id),
+                self.instance_id,
+                settings.SESSION_LEASE_MS,
+            )
+        for session_id, renewed in zip(session_ids, await pipe.execute()):
+            if not renewed and session_id in self._leases:
+                logger.warning(f"⚠️ Lost lease of session {session_id}, dropping it")
+                self._drop(session_id)
+
+    def _drop(self, session_id: str):
+        self._leases.discard(session_id)
+        self._cancel_timer(session_id)
+        self.sessions.pop(session_id, None)
+
+    async def _forward(
+        self, owner: str, session_id: str, command: str, args: Dict[str, Any]
+    ):
+        """Run a command on the owning worker and wait for its reply"""
+        reply_key = f"{self.REPLY_PREFIX}{uuid.uuid4().hex}"
+        message = {
+            "command": command,
+            "session_id": session_id,
+            "args": args,
+            "reply_to": reply_key,
+        }
+        try:
+            receivers = await self.redis.publish(
+                self.command_channel(owner), json.dumps(message)
+            )
+            if not receivers:
+                # The owner is gone; its lease expires and another worker adopts
+                raise SessionError(503, "Session is changing workers, try again")
+            reply = await self.redis.blpop(
+                [reply_key], timeout=settings.SESSION_FORWARD_TIMEOUT_MS / 1000
+            )
+        except SessionError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Error forwarding {command} for session {session_id}: {e}")
+            raise SessionError(503, "Session is unavailable, try again")
+
+        if reply is None:
+            raise SessionError(504, "Session worker did not respond")
+        self.forwarded += 1
+        result = json.loads(reply[1])
+        if "error" in result:
+            raise SessionError(result["status_code"], result["error"])
+        return result["result"]
+
+    async def _handle_command(self, message: Dict[str, Any]):
+        """Run a command forwarded by another worker and send back the result"""
+        try:
+            handler = self._commands[message["command"]]
+            result = {"result": await handler(message["session_id"], **message["args"])}
+        except SessionError as e:
+            result = {"error": e.detail, "status_code": e.status_code}
+        except Exception as e:
+            logger.error(f"❌ Error running forwarded session command: {e}")
+            result = {"error": "Internal server error", "status_code": 500}
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.rpush(message["reply_to"], json.dumps(result))
+            pipe.pexpire(message["reply_to"], settings.SESSION_FORWARD_TIMEOUT_MS)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Error replying to forwarded session command: {e}")
+
+    async def _listen_for_commands(self):
+        """Serve session commands forwarded to this worker"""
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.command_channel(self.instance_id))
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        task = asyncio.create_task(
+                            self._handle_command(json.loads(message["data"]))
+                        )
+                        self._command_tasks.add(task)
+                        task.add_done_callback(self._command_tasks.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Session command listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _maintain_leases(self):
+        """Renew this worker's leases and adopt sessions whose lease expired"""
+        while True:
+            await asyncio.sleep(settings.SESSION_LEASE_MS / 3000)
+            try:
+                await self._renew_leases()
+                await self.restore()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Error maintaining session leases: {e}")
+
+    async def _checkpoint(self, session: GameSession, reset_answers: bool = False):
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(
+                self.checkpoint_key(session.session_id),
+                json.dumps(session.to_checkpoint()),
+                ex=settings.SESSION_CHECKPOINT_TTL,
+            )
+            if session.status == RESULTS:
+                pipe.srem(self.RUNNING_KEY, session.session_id)
+            else:
+                pipe.sadd(self.RUNNING_KEY, session.session_id)
+            if reset_answers:
+                pipe.delete(self.answers_key(session.session_id))
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Error checkpointing session {session.session_id}: {e}")
+
+    async def _checkpoint_answer(
+        self, session: GameSession, player_id: str, answer: SessionAnswer
+    ):
+        if self.redis is None:
+            return
+        try:
+            key = self.answers_key(session.session_id)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(
+                key,
+                player_id,
+                json.dumps([answer.selected_option, answer.time_taken, answer.sid]),
+            )
+            pipe.expire(key, settings.SESSION_CHECKPOINT_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Error checkpointing answer for {player_id}: {e}")
+
+    def start_worker(self):
+        """Serve forwarded session commands and keep this worker's leases"""
+        if self.redis is None or self._background:
+            return
+        self._background = [
+            asyncio.create_task(self._listen_for_commands()),
+            asyncio.create_task(self._maintain_leases()),
+        ]
+
+    async def restore(self) -> int:
+        """Resume running sessions whose driving worker has gone away"""
+        if self.redis is None:
+            return 0
+
+        restored = 0
+        try:
+            for session_id in await self.redis.smembers(self.RUNNING_KEY):
+                session_id = session_id.decode()
+                if session_id in self._leases:
+                    continue
+                # Taken only once the previous owner's lease has expired
+                if not await self.redis.set(
+                    self.lease_key(session_id),
+                    self.instance_id,
+                    nx=True,
+                    px=settings.SESSION_LEASE_MS,
+                ):
+                    continue
+                self._leases.add(session_id)
+
+                data = await self.redis.get(self.checkpoint_key(session_id))
+                if data is None:
+                    await self.redis.srem(self.RUNNING_KEY, session_id)
+                    await self._release_lease(session_id)
+                    continue
+                session = GameSession.from_checkpoint(json.loads(data))
+                answers = await self.redis.hgetall(self.answers_key(session_id))
+                for player_id, encoded in answers.items():
+                    selected_option, time_taken, sid = json.loads(encoded)
+                    session.answers[player_id.decode()] = SessionAnswer(
+                        selected_option, time_taken, sid
+                    )
+
+                self.sessions[session_id] = session
+                if session.status == QUESTION_OPEN:
+                    self._schedule(
+                        session, session.closes_at_epoch - time.time(), self.close_round
+                    )
+                elif session.status == QUESTION_CLOSED:
+                    if session.is_last_round:
+                        self._schedule(session, 0, self.finish)
+                    else:
+                        self._schedule(
+                            session,
+                            session.next_round_at_epoch - time.time(),
+                            self._open_next_round,
+                        )
+                restored += 1
+        except Exception as e:
+            logger.error(f"❌ Error restoring game sessions: {e}")
+
+        if restored:
+            logger.info(f"🎮 Restored {restored} game sessions from checkpoints")
+        return restored
+
+    async def stop(self):
+        """Cancel session timers and hand this worker's sessions over.
+
+        Releasing the leases lets another worker adopt the sessions from
+        their checkpoints on its next lease check.
+        """
+        tasks = self._background + list(self._timers.values())
+        self._background = []
+        self._timers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for session_id in list(self._leases):
+            await self._release_lease(session_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "running": sum(
+                1 for session in self.sessions.values() if session.status != RESULTS
+            ),
+            "rounds_closed": self.rounds_closed,
+            "answers_scored": self.answers_scored,
+            "leases": len(self._leases),
+            "forwarded": self.forwarded,
+        }
+
+
+game_session_service = GameSessionService()
@@ -0,0 +1,269 @@
+import json
+import logging
+from datetime import datetime
+from typing import List, Optional
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.database.connection import get_database
+from app.models.player import (
+    DEFAULT_SESSION_ID,
+    LeaderboardEntry,
+    PlayerResponse,
+    player_from_document,
+    session_query,
+)
+
+logger = logging.getLogger(__name__)
+
+# Update a session's scores only while its set is live; an expired set is
+# rebuilt whole from MongoDB on its next read
+SESSION_ZADD_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    redis.call("zadd", KEYS[1], "GT", ARGV[2], ARGV[1])
+    return redis.call("expire", KEYS[1], ARGV[3])
+end
+return 0
+"""
+
+
+class LeaderboardService:
+    """Leaderboard engine backed by a Redis sorted set.
+
+    Scores live in a sorted set (player id -> score) and display data in a
+    hash (player id -> JSON name/joined_at/session), so score updates, top-N
+    and rank queries are all O(log n) instead of a full sort of the players
+    collection. Each game session also gets its own sorted set for the
+    leaderboard broadcast to its room; apart from the default session's,
+    these expire once the session has been idle for
+    LEADERBOARD_SESSION_TTL.
+    """
+
+    SCORES_KEY = "leaderboard:scores"
+    PLAYERS_KEY = "leaderboard:players"
+    REBUILD_BATCH_SIZE = 1000
+
+    def __init__(self):
+        self.players_collection_name = "players"
+
+    @property
+    def is_available(self) -> bool:
+        return cache_service.is_connected and cache_service.redis_client is not None
+
+    @property
+    def redis(self):
+        return cache_service.redis_client
+
+    @staticmethod
+    def session_scores_key(session_id: str) -> str:
+        return f"leaderboard:session:{session_id}:scores"
+
+    @staticmethod
+    def _encode_player(player: PlayerResponse) -> str:
+        return json.dumps(
+            {
+                "name": player.name,
+                "joined_at": player.joined_at.isoformat(),
+                "session_id": player.session_id,
+            }
+        )
+
+    async def rebuild_if_empty(self) -> int:
+        """Rebuild the sorted sets from MongoDB when Redis has no leaderboard.
+
+        The default session's set is checked too: Redis data written before
+        per-session sets existed has only the global one.
+        """
+        if not self.is_available:
+            return 0
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zcard(self.SCORES_KEY)
+            pipe.zcard(self.session_scores_key(DEFAULT_SESSION_ID))
+            if all(await pipe.execute()):
+                return 0
+            return await self.rebuild()
+        except Exception as e:
+            logger.error(f"❌ Error checking leaderboard state: {e}")
+            return 0
+
+    async def rebuild(self) -> int:
+        """Load every player's score from MongoDB into Redis"""
+        if not self.is_available:
+            return 0
+
+        total = await self._load_players({})
+        logger.info(f"🏆 Rebuilt leaderboard with {total} players")
+        return total
+
+    async def _load_players(self, query: dict) -> int:
+        collection = get_database()[self.players_collection_name]
+        cursor = collection.find(
+            query, {"name": 1, "score": 1, "joined_at": 1, "session_id": 1}
+        )
+
+        total = 0
+        scores, sessions, players = {}, {}, {}
+        try:
+            async for player_data in cursor:
+                player_id = str(player_data["_id"])
+                session_id = player_data.get("session_id") or DEFAULT_SESSION_ID
+                scores[player_id] = player_data.get("score", 0)
+                sessions[player_id] = session_id
+                players[player_id] = json.dumps(
+                    {
+                        "name": player_data["name"],
+                        "joined_at": player_data["joined_at"].isoformat(),
+                        "session_id": session_id,
+                    }
+                )
+                if len(scores) >= self.REBUILD_BATCH_SIZE:
+                    total += await self._write_batch(scores, sessions, players)
+                    scores, sessions, players = {}, {}, {}
+
+            if scores:
+                total += await self._write_batch(scores, sessions, players)
+            return total
+        except Exception as e:
+            logger.error(f"❌ Error rebuilding leaderboard: {e}")
+            return total
+
+    async def _write_batch(self, scores: dict, sessions: dict, players: dict) -> int:
+        by_session = {}
+        for player_id, score in scores.items():
+            by_session.setdefault(sessions[player_id], {})[player_id] = score
+
+        pipe = self.redis.pipeline(transaction=False)
+        # GT keeps scores written concurrently by live answers
+        pipe.zadd(self.SCORES_KEY, scores, gt=True)
+        for session_id, session_scores in by_session.items():
+            key = self.session_scores_key(session_id)
+            pipe.zadd(key, session_scores, gt=True)
+            if session_id != DEFAULT_SESSION_ID:
+                pipe.expire(key, settings.LEADERBOARD_SESSION_TTL)
+        pipe.hset(self.PLAYERS_KEY, mapping=players)
+        await pipe.execute()
+        return len(scores)
+
+    async def set_player_score(self, player: PlayerResponse) -> bool:
+        """Record a player's current score.
+
+        Scores only ever grow, so ZADD GT makes the update atomic and
+        idempotent even when concurrent answers land out of order.
+        """
+        return await self.set_player_scores([player])
+
+    async def set_player_scores(self, players: List[PlayerResponse]) -> bool:
+        """Record several players' scores in one pipeline"""
+        if not self.is_available or not players:
+            return False
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for player in players:
+                pipe.zadd(self.SCORES_KEY, {player.id: player.score}, gt=True)
+                key = self.session_scores_key(player.session_id)
+                if player.session_id == DEFAULT_SESSION_ID:
+                    pipe.zadd(key, {player.id: player.score}, gt=True)
+                else:
+                    pipe.eval(
+                        SESSION_ZADD_SCRIPT,
+                        1,
+                        key,
+                        player.id,
+                        player.score,
+                        settings.LEADERBOARD_SESSION_TTL,
+                    )
+                pipe.hsetnx(self.PLAYERS_KEY, player.id, self._encode_player(player))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(
+                f"❌ Error updating leaderboard for {len(players)} players: {e}"
+            )
+            return False
+
+    async def _load_entries(
+        self, start: int, stop: int, scores_key: str = SCORES_KEY
+    ) -> List[LeaderboardEntry]:
+        """Load ranked entries for the inclusive 0-based rank range"""
+        members = await self.redis.zrevrange(scores_key, start, stop, withscores=True)
+        if not members:
+            return []
+
+        player_ids = [player_id for player_id, _ in members]
+        encoded_players = await self.redis.hmget(self.PLAYERS_KEY, player_ids)
+
+        entries = []
+        for offset, ((player_id, score), encoded) in enumerate(
+            zip(members, encoded_players)
+        ):
+            if encoded is None:
+                continue
+            player_data = json.loads(encoded)
+            player_data["_id"] = player_id.decode()  # the client returns raw bytes
+            player_data["score"] = int(score)
+            player_data["joined_at"] = datetime.fromisoformat(player_data["joined_at"])
+            entries.append(player_from_document(player_data, rank=start + offset + 1))
+        return entries
+
+    async def get_top(
+        self, limit: int = 10, session_id: Optional[str] = None
+    ) -> Optional[List[LeaderboardEntry]]:
+        """Get the top players overall or in a session; None without Redis"""
+        if not self.is_available:
+            return None
+
+        scores_key = (
+            self.SCORES_KEY
+            if session_id is None
+            else self.session_scores_key(session_id)
+        )
+        try:
+            entries = await self._load_entries(0, limit - 1, scores_key)
+            if (
+                not entries
+                and session_id is not None
+                and not await self.redis.exists(scores_key)
+            ):
+                # New or expired session: load its players from MongoDB
+                await self._load_players(session_query(session_id))
+                entries = await self._load_entries(0, limit - 1, scores_key)
+            return entries
+        except Exception as e:
+            logger.error(f"❌ Error reading leaderboard top {limit}: {e}")
+            return None
+
+    async def get_rank(self, player_id: str) -> Optional[LeaderboardEntry]:
+        """Get a single player's 1-based rank and score"""
+        if not self.is_available:
+            return None
+
+        try:
+            rank = await self.redis.zrevrank(self.SCORES_KEY, player_id)
+            if rank is None:
+                return None
+            entries = await self._load_entries(rank, rank)
+            return entries[0] if entries else None
+        except Exception as e:
+            logger.error(f"❌ Error reading leaderboard rank for {player_id}: {e}")
+            return None
+
+    async def get_around(
+        self, player_id: str, radius: int = 5
+    ) -> Optional[List[LeaderboardEntry]]:
+        """Get the players ranked within `radius` places of a player"""
+        if not self.is_available:
+            return None
+
+        try:
+            rank = await self.redis.zrevrank(self.SCORES_KEY, player_id)
+            if rank is None:
+                return []
+            return await self._load_entries(max(rank - radius, 0), rank + radius)
+        except Exception as e:
+            logger.error(f"❌ Error reading players around {player_id}: {e}")
+            return None
+
+
+leaderboard_service = LeaderboardService()
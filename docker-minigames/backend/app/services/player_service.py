@@ -1,13 +1,50 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from datetime import datetime
 from app.database.connection import get_database
-from app.models.player import Player, PlayerCreate, PlayerResponse
+from app.models.player import (
+    DEFAULT_SESSION_ID,
+    Player,
+    PlayerCreate,
+    PlayerResponse,
+    LeaderboardEntry,
+    player_from_document,
+    session_query,
+)
+from app.services.leaderboard_service import leaderboard_service
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def answer_stats_update(
+    points_earned: int, time_taken: float, is_correct: bool
+) -> List[dict]:
+    """Aggregation-pipeline update applying one answer to a player's stats"""
+    total = {"$ifNull": ["$total_questions", 0]}
+    previous_speed = {"$ifNull": ["$average_speed", 0]}
+    speed_sum = {"$add": [{"$multiply": [previous_speed, total]}, time_taken]}
+
+    return [
+        {
+            "$set": {
+                "score": {"$add": [{"$ifNull": ["$score", 0]}, points_earned]},
+                "total_questions": {"$add": [total, 1]},
+                "correct_answers": {
+                    "$add": [
+                        {"$ifNull": ["$correct_answers", 0]},
+                        1 if is_correct else 0,
+                    ]
+                },
+                "average_speed": {
+                    "$round": [{"$divide": [speed_sum, {"$add": [total, 1]}]}, 2]
+                },
+            }
+        }
+    ]
+
+
 class PlayerService:
     def __init__(self):
         self.collection_name = "players"
@@ -21,6 +58,7 @@ class PlayerService:
         try:
             player_dict = {
                 "name": player_data.name,
+                "session_id": player_data.session_id,
                 "score": 0,
                 "joined_at": datetime.utcnow(),
                 "total_questions": 0,  # Track total questions answered
@@ -32,12 +70,9 @@ class PlayerService:
             logger.info(f"Created player with ID: {result.inserted_id}")
 
             created_player = await self.collection.find_one({"_id": result.inserted_id})
-            return PlayerResponse(
-                id=str(created_player["_id"]),
-                name=created_player["name"],
-                score=created_player["score"],
-                joined_at=created_player["joined_at"],
-            )
+            player = player_from_document(created_player)
+            await leaderboard_service.set_player_score(player)
+            return player
         except Exception as e:
             logger.error(f"Error creating player: {e}")
             raise
@@ -52,12 +87,7 @@ class PlayerService:
             player_data = await self.collection.find_one({"_id": ObjectId(player_id)})
             if player_data:
                 logger.info(f"Found player: {player_id}")
-                return PlayerResponse(
-                    id=str(player_data["_id"]),
-                    name=player_data["name"],
-                    score=player_data["score"],
-                    joined_at=player_data["joined_at"],
-                )
+                return player_from_document(player_data)
             else:
                 logger.warning(f"Player not found: {player_id}")
                 return None
@@ -82,52 +112,21 @@ class PlayerService:
                 f"Updating player {player_id}: +{points_earned} points, {time_taken}s"
             )
 
-            # Get current player data for average calculation
-            current_player = await self.collection.find_one(
-                {"_id": ObjectId(player_id)}
-            )
-            if not current_player:
-                logger.warning(f"Player not found for score update: {player_id}")
-                return None
-
-            # Calculate new statistics
-            current_total = current_player.get("total_questions", 0)
-            current_correct = current_player.get("correct_answers", 0)
-            current_avg_speed = current_player.get("average_speed", 0.0)
-
-            new_total = current_total + 1
-            new_correct = current_correct + (1 if is_correct else 0)
-
-            # Calculate new average speed
-            if current_total > 0:
-                new_avg_speed = (
-                    (current_avg_speed * current_total) + time_taken
-                ) / new_total
-            else:
-                new_avg_speed = time_taken
-
-            # Update with statistics
+            # Single server-side update: counters and the running average are
+            # computed from the stored values, so concurrent answers can't
+            # overwrite each other
             result = await self.collection.find_one_and_update(
                 {"_id": ObjectId(player_id)},
-                {
-                    "$inc": {"score": points_earned},
-                    "$set": {
-                        "total_questions": new_total,
-                        "correct_answers": new_correct,
-                        "average_speed": round(new_avg_speed, 2),
-                    },
-                },
-                return_document=True,
+                answer_stats_update(points_earned, time_taken, is_correct),
+                projection={"name": 1, "score": 1, "joined_at": 1, "session_id": 1},
+                return_document=ReturnDocument.AFTER,
             )
 
             if result:
                 logger.info(f"Updated player {player_id} score to {result['score']}")
-                return PlayerResponse(
-                    id=str(result["_id"]),
-                    name=result["name"],
-                    score=result["score"],
-                    joined_at=result["joined_at"],
-                )
+                player = player_from_document(result)
+                await leaderboard_service.set_player_score(player)
+                return player
             else:
                 logger.warning(f"Player not found for score update: {player_id}")
                 return None
@@ -135,25 +134,131 @@ class PlayerService:
             logger.error(f"Error updating player score: {e}")
             return None
 
-    async def get_leaderboard(self, limit: int = 10) -> List[PlayerResponse]:
-        """Get top players by score"""
+    async def update_player_scores(
+        self, answers: List[Tuple[str, int, float, bool]]
+    ) -> Dict[str, PlayerResponse]:
+        """Apply a batch of (player_id, points, time_taken, is_correct) answers
+        with one bulk write; returns the updated players by ID"""
+        # One bad ID must not cost the rest of the batch their points
+        valid_answers = [answer for answer in answers if ObjectId.is_valid(answer[0])]
+        if len(valid_answers) < len(answers):
+            logger.warning(
+                f"Skipping {len(answers) - len(valid_answers)} answers with invalid player IDs"
+            )
+        answers = valid_answers
+        if not answers:
+            return {}
+
         try:
-            cursor = self.collection.find().sort("score", -1).limit(limit)
-            players = []
-            async for player_data in cursor:
-                players.append(
-                    PlayerResponse(
-                        id=str(player_data["_id"]),
-                        name=player_data["name"],
-                        score=player_data["score"],
-                        joined_at=player_data["joined_at"],
+            await self.collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": ObjectId(player_id)},
+                        answer_stats_update(points_earned, time_taken, is_correct),
                     )
-                )
+                    for player_id, points_earned, time_taken, is_correct in answers
+                ],
+                ordered=False,
+            )
+
+            cursor = self.collection.find(
+                {"_id": {"$in": [ObjectId(answer[0]) for answer in answers]}},
+                {"name": 1, "score": 1, "joined_at": 1, "session_id": 1},
+            )
+            players = {}
+            async for player_data in cursor:
+                player = player_from_document(player_data)
+                players[player.id] = player
+
+            await leaderboard_service.set_player_scores(list(players.values()))
+            logger.info(f"Applied {len(answers)} answers to {len(players)} players")
+            return players
+        except Exception as e:
+            logger.error(f"Error applying {len(answers)} answers: {e}")
+            return {}
+
+    async def get_leaderboard(
+        self, limit: int = 10, session_id: Optional[str] = None
+    ) -> List[PlayerResponse]:
+        """Get top players by score, overall or within one game session"""
+        try:
+            leaderboard = await leaderboard_service.get_top(limit, session_id)
+            if leaderboard is not None:
+                return leaderboard
+
+            # Fall back to MongoDB when Redis is unavailable
+            query = session_query(session_id) if session_id is not None else {}
+            cursor = self.collection.find(query).sort("score", -1).limit(limit)
+            players = [
+                player_from_document(player_data) async for player_data in cursor
+            ]
             logger.info(f"Retrieved {len(players)} players for leaderboard")
             return players
         except Exception as e:
             logger.error(f"Error getting leaderboard: {e}")
             raise
 
+    async def _get_rank_from_db(self, player_id: str) -> Optional[LeaderboardEntry]:
+        """Compute a player's rank with a MongoDB count"""
+        player_data = await self.collection.find_one({"_id": ObjectId(player_id)})
+        if not player_data:
+            return None
+
+        higher_scores = await self.collection.count_documents(
+            {"score": {"$gt": player_data["score"]}}
+        )
+        return player_from_document(player_data, rank=higher_scores + 1)
+
+    async def get_player_rank(self, player_id: str) -> Optional[LeaderboardEntry]:
+        """Get a player's leaderboard position"""
+        try:
+            if not ObjectId.is_valid(player_id):
+                logger.warning(f"Invalid player ID format: {player_id}")
+                return None
+
+            entry = await leaderboard_service.get_rank(player_id)
+            if entry is not None:
+                return entry
+
+            return await self._get_rank_from_db(player_id)
+        except Exception as e:
+            logger.error(f"Error getting rank for player {player_id}: {e}")
+            raise
+
+    async def get_players_around(
+        self, player_id: str, radius: int = 5
+    ) -> List[LeaderboardEntry]:
+        """Get the players ranked just above and below a player"""
+        try:
+            if not ObjectId.is_valid(player_id):
+                logger.warning(f"Invalid player ID format: {player_id}")
+                return []
+
+            entries = await leaderboard_service.get_around(player_id, radius)
+            if entries:
+                return entries
+
+            # Fall back to MongoDB when Redis is unavailable or missing the player
+            player_entry = await self._get_rank_from_db(player_id)
+            if player_entry is None:
+                return []
+
+            start = max(player_entry.rank - 1 - radius, 0)
+            cursor = (
+                self.collection.find()
+                .sort("score", -1)
+                .skip(start)
+                .limit(2 * radius + 1)
+            )
+            entries = []
+            async for player_data in cursor:
+                entries.append(
+                    player_from_document(player_data, rank=start + len(entries) + 1)
+                )
+            return entries
+        except Exception as e:
+            logger.error(f"Error getting players around {player_id}: {e}")
+            raise
+
 
 player_service = PlayerService()
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+from bson import ObjectId
+from app.database.connection import get_database
+from app.core.cache import QUESTIONS_NAMESPACE
+from app.models.question import question_response_from_document
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerKey:
+    """Answer key and scoring parameters for a single question"""
+
+    id: str
+    correct_answer: int
+    time_limit: int = 30
+    max_points: int = 100
+
+    @classmethod
+    def from_document(cls, question_id: str, data: Mapping[str, Any]) -> "AnswerKey":
+        return cls(
+            id=question_id,
+            correct_answer=data["correct_answer"],
+            time_limit=data.get("time_limit", 30),
+            max_points=data.get("max_points", 100),
+        )
+
+
+def render_question_json(question_id: str, data: Mapping[str, Any]) -> bytes:
+    """Pre-serialize the public QuestionResponse for a question"""
+    return question_response_from_document(data, question_id).model_dump_json().encode()
+
+
+class QuestionCatalog:
+    """Process-local, read-only index of the question bank.
+
+    Holds each question's answer key, so answer verification does not need
+    a database round trip, and its public QuestionResponse as pre-rendered
+    JSON, so random question sets are drawn without touching MongoDB.
+    Loaded once at startup and kept in sync by the admin router.
+    """
+
+    def __init__(self):
+        self.collection_name = "questions"
+        self._entries: Dict[str, AnswerKey] = {}
+        self._fragments: Dict[str, bytes] = {}
+        # Fragments and their IDs in sampling order, with each ID's
+        # position, so single-question updates don't rebuild the pool
+        self._pool: List[bytes] = []
+        self._pool_ids: List[str] = []
+        self._pool_index: Dict[str, int] = {}
+        self.is_loaded = False
+
+    @property
+    def collection(self):
+        return get_database()[self.collection_name]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self) -> int:
+        """(Re)load every question from MongoDB"""
+        entries: Dict[str, AnswerKey] = {}
+        fragments: Dict[str, bytes] = {}
+        cursor = self.collection.find({})
+        async for question_data in cursor:
+            question_id = str(question_data["_id"])
+            entries[question_id] = AnswerKey.from_document(question_id, question_data)
+            fragments[question_id] = render_question_json(question_id, question_data)
+
+        # Swap the whole index at once so readers never see a partial load
+        self._entries = entries
+        self._fragments = fragments
+        self._pool = list(fragments.values())
+        self._pool_ids = list(fragments)
+        self._pool_index = {
+            question_id: index for index, question_id in enumerate(self._pool_ids)
+        }
+        self.is_loaded = True
+        logger.info(f"📚 Question catalog loaded with {len(entries)} questions")
+        return len(entries)
+
+    async def get(self, question_id: str) -> Optional[AnswerKey]:
+        """Get answer key by question ID, falling back to MongoDB on a miss"""
+        entry = self._entries.get(question_id)
+        if entry is not None:
+            return entry
+
+        # Another worker may have created the question after our load
+        if not ObjectId.is_valid(question_id):
+            return None
+
+        question_data = await self.collection.find_one({"_id": ObjectId(question_id)})
+        if not question_data:
+            return None
+
+        return self.upsert(question_id, question_data)
+
+    def sample_json(self, count: int) -> Optional[bytes]:
+        """A JSON array of up to `count` distinct random questions"""
+        if not self._pool:
+            return None
+
+        picked = random.sample(self._pool, min(count, len(self._pool)))
+        return b"[" + b",".join(picked) + b"]"
+
+    def sample_ids(self, count: int) -> List[str]:
+        """Up to `count` distinct random question IDs"""
+        return random.sample(self._pool_ids, min(count, len(self._pool_ids)))
+
+    def public_question(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """The public QuestionResponse of a loaded question, as a dict"""
+        fragment = self._fragments.get(question_id)
+        return json.loads(fragment) if fragment is not None else None
+
+    def upsert(self, question_id: str, data: Mapping[str, Any]) -> AnswerKey:
+        """Add or replace a question"""
+        entry = AnswerKey.from_document(question_id, data)
+        fragment = render_question_json(question_id, data)
+        self._entries[question_id] = entry
+        self._fragments[question_id] = fragment
+
+        index = self._pool_index.get(question_id)
+        if index is None:
+            self._pool_index[question_id] = len(self._pool)
+            self._pool.append(fragment)
+            self._pool_ids.append(question_id)
+        else:
+            self._pool[index] = fragment
+        return entry
+
+    def remove(self, question_id: str) -> bool:
+        """Drop a deleted question"""
+        self._fragments.pop(question_id, None)
+        index = self._pool_index.pop(question_id, None)
+        if index is not None:
+            # Move the last fragment into the gap
+            last_fragment = self._pool.pop()
+            last_id = self._pool_ids.pop()
+            if last_id != question_id:
+                self._pool[index] = last_fragment
+                self._pool_ids[index] = last_id
+                self._pool_index[last_id] = index
+        return self._entries.pop(question_id, None) is not None
+
+    async def on_cache_invalidation(self, message: Mapping[str, Any]):
+        """Reload when another worker invalidates the question caches"""
+        if self.is_loaded and QUESTIONS_NAMESPACE in message.get("namespaces", {}):
+            await self.load()
+
+    def clear(self):
+        self._entries = {}
+        self._fragments = {}
+        self._pool = []
+        self._pool_ids = []
+        self._pool_index = {}
+        self.is_loaded = False
+
+
+question_catalog = QuestionCatalog()
@@ -1,12 +1,25 @@
 from typing import List, Optional, Tuple
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from app.database.connection import get_database
-from app.models.question import Question, QuestionResponse
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.models.question import (
+    Question,
+    QuestionResponse,
+    normalize_question_text,
+    question_from_document,
+    question_response_from_document,
+)
+from app.services.question_catalog import AnswerKey, question_catalog
 import logging
 import math
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY_ERROR = 11000
+
 
 SAMPLE_QUESTIONS = [
     {
@@ -201,23 +214,26 @@ class QuestionService:
         """Get all questions without correct answers"""
         try:
             cursor = self.collection.find()
-            questions = []
-            async for question_data in cursor:
-                questions.append(
-                    QuestionResponse(
-                        id=str(question_data["_id"]),
-                        question=question_data["question"],
-                        options=question_data["options"],
-                        time_limit=question_data.get("time_limit", 30),
-                        max_points=question_data.get("max_points", 100),
-                    )
-                )
+            questions = [
+                question_response_from_document(question_data)
+                async for question_data in cursor
+            ]
             logger.info(f"Retrieved {len(questions)} questions")
             return questions
         except Exception as e:
             logger.error(f"Error getting questions: {e}")
             raise
 
+    async def get_question_count(self) -> int:
+        """Total number of questions, cached"""
+        # Concurrent misses share one load
+        return await cache_service.get_or_load(
+            await cache_service.get_question_count_cache_key(),
+            lambda: self.collection.count_documents({}),
+            ttl=settings.QUESTIONS_CACHE_TTL,
+            stale_ttl=settings.QUESTIONS_STALE_TTL,
+        )
+
     async def get_question(self, question_id: str) -> Optional[Question]:
         """Get question by ID with correct answer"""
         try:
@@ -230,31 +246,8 @@ class QuestionService:
             )
 
             if question_data:
-                try:
-                    question = Question(
-                        _id=question_data["_id"],
-                        question=question_data["question"],
-                        options=question_data["options"],
-                        correct_answer=question_data["correct_answer"],
-                        time_limit=question_data.get("time_limit", 30),
-                        max_points=question_data.get("max_points", 100),
-                    )
-                    logger.info(f"Found question: {question_id}")
-                    return question
-                except Exception as construct_error:
-                    logger.error(
-                        f"Error constructing question object: {construct_error}"
-                    )
-                    return Question.model_validate(
-                        {
-                            "_id": str(question_data["_id"]),
-                            "question": question_data["question"],
-                            "options": question_data["options"],
-                            "correct_answer": question_data["correct_answer"],
-                            "time_limit": question_data.get("time_limit", 30),
-                            "max_points": question_data.get("max_points", 100),
-                        }
-                    )
+                logger.info(f"Found question: {question_id}")
+                return question_from_document(question_data)
             else:
                 logger.warning(f"Question not found: {question_id}")
                 return None
@@ -298,49 +291,38 @@ class QuestionService:
 
     async def verify_answer_and_calculate_score(
         self, question_id: str, selected_option: int, time_taken: float
-    ) -> Tuple[bool, int, int, Optional[Question]]:
+    ) -> Tuple[bool, int, int, Optional[AnswerKey]]:
         """
         Verify answer and calculate score based on correctness and speed
-        Returns: (is_correct, total_points, speed_bonus, question)
+        Returns: (is_correct, total_points, speed_bonus, answer_key)
         """
         try:
             if not ObjectId.is_valid(question_id):
                 logger.error(f"Invalid ObjectId format: {question_id}")
                 return False, 0, 0, None
 
-            question_data = await self.collection.find_one(
-                {"_id": ObjectId(question_id)}
-            )
+            # Answer keys are served from the in-memory catalog
+            answer_key = await question_catalog.get(question_id)
 
-            if not question_data:
+            if answer_key is None:
                 logger.error(f"Question not found for verification: {question_id}")
                 return False, 0, 0, None
 
-            # Create question object with proper ObjectId handling
-            question = Question(
-                _id=str(question_data["_id"]),  # Convert ObjectId to string
-                question=question_data["question"],
-                options=question_data["options"],
-                correct_answer=question_data["correct_answer"],
-                time_limit=question_data.get("time_limit", 30),
-                max_points=question_data.get("max_points", 100),
-            )
-
             # Check correctness
-            is_correct = question.correct_answer == selected_option
+            is_correct = answer_key.correct_answer == selected_option
 
             # Calculate score
             total_points, speed_bonus = self.calculate_score(
-                is_correct, time_taken, question.max_points, question.time_limit
+                is_correct, time_taken, answer_key.max_points, answer_key.time_limit
             )
 
             logger.info(
                 f"Answer verification - Question: {question_id}, "
-                f"Selected: {selected_option}, Correct: {question.correct_answer}, "
+                f"Selected: {selected_option}, Correct: {answer_key.correct_answer}, "
                 f"Time: {time_taken}s, Points: {total_points} (Speed: {speed_bonus})"
             )
 
-            return is_correct, total_points, speed_bonus, question
+            return is_correct, total_points, speed_bonus, answer_key
 
         except Exception as e:
             logger.error(f"Error verifying answer and calculating score: {e}")
@@ -348,16 +330,39 @@ class QuestionService:
 
     async def seed_questions(self):
         """Seed initial questions for demo with timing data"""
-        sample_questions = SAMPLE_QUESTIONS
+        sample_questions = [
+            {**question, "question_key": normalize_question_text(question["question"])}
+            for question in SAMPLE_QUESTIONS
+        ]
 
         try:
             # Check if questions already exist
             count = await self.collection.count_documents({})
             if count == 0:
-                result = await self.collection.insert_many(sample_questions)
-                logger.info(
-                    f"✅ Seeded {len(result.inserted_ids)} questions successfully"
-                )
+                # Workers starting together may all see an empty collection;
+                # upserts keyed on question_key make the seed idempotent
+                requests = [
+                    UpdateOne(
+                        {"question_key": question["question_key"]},
+                        {"$setOnInsert": question},
+                        upsert=True,
+                    )
+                    for question in sample_questions
+                ]
+                try:
+                    result = (
+                        await self.collection.bulk_write(requests, ordered=False)
+                    ).bulk_api_result
+                except BulkWriteError as e:
+                    # Concurrent upserts of the same key; the other write won
+                    if any(
+                        error["code"] != DUPLICATE_KEY_ERROR
+                        for error in e.details["writeErrors"]
+                    ):
+                        raise
+                    result = e.details
+                # The catalog is loaded from the collection after seeding
+                logger.info(f"✅ Seeded {result['nUpserted']} questions successfully")
                 print(f"✅ Sample questions seeded successfully")
             else:
                 logger.info(f"📚 Found {count} existing questions in database")
@@ -366,5 +371,21 @@ class QuestionService:
             logger.error(f"Error seeding questions: {e}")
             raise
 
+    async def backfill_question_keys(self) -> int:
+        """Set question_key on questions written before it existed"""
+        requests = [
+            UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"question_key": normalize_question_text(doc["question"])}},
+            )
+            async for doc in self.collection.find(
+                {"question_key": {"$exists": False}}, {"question": 1}
+            )
+        ]
+        if requests:
+            await self.collection.bulk_write(requests, ordered=False)
+            logger.info(f"🔑 Backfilled question_key on {len(requests)} questions")
+        return len(requests)
+
 
 question_service = QuestionService()
@@ -0,0 +1,71 @@
+"""Compare cache codecs on the payloads the backend actually caches.
+
+Run from the backend directory:
+
+    python -m benchmarks.cache_codecs
+"""
+
+import timeit
+from datetime import datetime, timedelta
+from itertools import cycle, islice
+from bson import ObjectId
+from app.core.cache_codecs import CODECS, decode_value, encode_value
+from app.models.player import LeaderboardEntry
+from app.models.question import QuestionResponse
+from app.services.question_service import SAMPLE_QUESTIONS
+
+ROUNDS = 2000
+
+
+def question_list(count: int = 50) -> list:
+    """A cached question list: `count` QuestionResponse dicts"""
+    return [
+        QuestionResponse(
+            id=str(ObjectId()),
+            question=q["question"],
+            options=q["options"],
+            time_limit=q["time_limit"],
+            max_points=q["max_points"],
+        ).model_dump()
+        for q in islice(cycle(SAMPLE_QUESTIONS), count)
+    ]
+
+
+def leaderboard_snapshot(count: int = 10) -> list:
+    """A leaderboard snapshot: `count` ranked entries with datetimes"""
+    joined_at = datetime.utcnow()
+    return [
+        LeaderboardEntry(
+            id=str(ObjectId()),
+            name=f"Player {rank}",
+            score=10_000 - rank * 37,
+            joined_at=joined_at - timedelta(seconds=rank),
+            rank=rank,
+        ).model_dump()
+        for rank in range(1, count + 1)
+    ]
+
+
+def main():
+    payloads = {
+        "50 questions": question_list(50),
+        "leaderboard top 10": leaderboard_snapshot(10),
+        "leaderboard top 100": leaderboard_snapshot(100),
+    }
+
+    print(f"{'payload':<22}{'codec':<10}{'bytes':>8}{'encode µs':>12}{'decode µs':>12}")
+    for payload_name, payload in payloads.items():
+        for codec in CODECS.values():
+            encoded = encode_value(codec, payload)
+            encode_time = timeit.timeit(
+                lambda: encode_value(codec, payload), number=ROUNDS
+            )
+            decode_time = timeit.timeit(lambda: decode_value(encoded), number=ROUNDS)
+            print(
+                f"{payload_name:<22}{codec.name:<10}{len(encoded):>8}"
+                f"{encode_time / ROUNDS * 1e6:>12.1f}{decode_time / ROUNDS * 1e6:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
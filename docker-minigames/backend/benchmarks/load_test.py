@@ -0,0 +1,298 @@
+"""End-to-end load test: N simulated players against the quiz backend.
+
+Each player holds a Socket.IO connection in its game session, joins with
+POST /api/join, fetches GET /api/questions/random and answers with
+POST /api/answer after a random think time. A host socket in the same
+session receives every player_answered event. The report covers request
+latency percentiles, throughput and Socket.IO fan-out delay.
+
+Run from the backend directory (pip install -r benchmarks/requirements.txt):
+
+    # against a running backend, e.g. docker compose --profile local up
+    python -m benchmarks.load_test --players 200
+
+    # against the app started in-process with in-memory MongoDB and Redis
+    python -m benchmarks.load_test --players 50 --in-memory
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import aiohttp
+import socketio
+
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "your-secure-admin-key-here")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.events: Dict[str, int] = defaultdict(int)
+        # (player_id, question_id) -> when the answer request was sent
+        self.answers_sent: Dict[Tuple[str, str], float] = {}
+        self.answer_delays: List[float] = []
+        # leaderboard version -> when each socket received it
+        self.leaderboard_receipts: Dict[int, List[float]] = defaultdict(list)
+        self.started = 0.0
+        self.finished = 0.0
+
+    async def request(self, http, method: str, route: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            async with http.request(method, url, **kwargs) as response:
+                body = await response.json()
+                ok = response.status < 400
+        except Exception:
+            body, ok = None, False
+        self.latencies[f"{method} {route}"].append(time.perf_counter() - started)
+        if not ok:
+            self.errors[f"{method} {route}"] += 1
+            return None
+        return body
+
+    def on_player_joined(self, data):
+        self.events["player_joined"] += 1
+
+    def on_leaderboard_updated(self, data):
+        self.events["leaderboard_updated"] += 1
+        if isinstance(data, dict) and "version" in data:
+            self.leaderboard_receipts[data["version"]].append(time.perf_counter())
+
+    def on_player_answered(self, data):
+        self.events["player_answered"] += 1
+        sent = self.answers_sent.get((data.get("player_id"), data.get("question_id")))
+        if sent is not None:
+            self.answer_delays.append(time.perf_counter() - sent)
+
+
+async def run_player(index: int, args, http, stats: LoadStats):
+    await asyncio.sleep(random.uniform(0, args.ramp_up))
+
+    sio = socketio.AsyncClient(reconnection=False)
+    sio.on("leaderboard_updated", stats.on_leaderboard_updated)
+    sio.on("player_joined", stats.on_player_joined)
+    try:
+        await sio.connect(args.url, transports=["websocket"])
+    except Exception:
+        stats.errors["socket connect"] += 1
+        sio = None
+
+    api = f"{args.url}/api"
+    player = await stats.request(
+        http,
+        "POST",
+        "/api/join",
+        f"{api}/join",
+        json={"name": f"load-{index}", "session_id": args.session},
+    )
+    if player is None:
+        return
+
+    if sio is not None:
+        await sio.call(
+            "join_session", {"session_id": args.session, "player_id": player["id"]}
+        )
+
+    questions = await stats.request(
+        http,
+        "GET",
+        "/api/questions/random",
+        f"{api}/questions/random",
+        params={"count": args.questions},
+    )
+    for question in questions or []:
+        think_time = random.uniform(args.think_min, args.think_max)
+        await asyncio.sleep(think_time)
+        stats.answers_sent[(player["id"], question["id"])] = time.perf_counter()
+        await stats.request(
+            http,
+            "POST",
+            "/api/answer",
+            f"{api}/answer",
+            json={
+                "player_id": player["id"],
+                "question_id": question["id"],
+                "selected_option": random.randrange(len(question["options"])),
+                "time_taken": min(max(think_time, 0.1), question["time_limit"]),
+            },
+        )
+
+    if sio is not None:
+        # Stay connected for broadcasts still in flight
+        await asyncio.sleep(args.linger)
+        await sio.disconnect()
+
+
+async def run_host(args, stats: LoadStats, done: asyncio.Event):
+    """One host socket per session receives every player_answered event"""
+    sio = socketio.AsyncClient(reconnection=False)
+    sio.on("player_answered", stats.on_player_answered)
+    await sio.connect(args.url, transports=["websocket"])
+    ack = await sio.call(
+        "host_session", {"session_id": args.session, "admin_key": ADMIN_API_KEY}
+    )
+    if isinstance(ack, dict) and ack.get("error"):
+        print(f"⚠️ Host socket rejected ({ack['error']}); no answer fan-out data")
+    await done.wait()
+    await sio.disconnect()
+
+
+def report(args, stats: LoadStats):
+    duration = stats.finished - stats.started
+    total_requests = sum(len(values) for values in stats.latencies.values())
+    answers = len(stats.latencies["POST /api/answer"])
+
+    print(
+        f"\nPlayers: {args.players}  session: {args.session}  "
+        f"duration: {duration:.1f}s"
+    )
+    print(
+        f"Throughput: {total_requests / duration:.1f} req/s, "
+        f"{answers / duration:.1f} answers/s\n"
+    )
+
+    print(
+        f"{'request':<28}{'count':>7}{'errors':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for route, values in sorted(stats.latencies.items()):
+        print(
+            f"{route:<28}{len(values):>7}{stats.errors[route]:>8}"
+            + "".join(
+                f"{percentile(values, pct) * 1000:>10.1f}" for pct in (50, 95, 99)
+            )
+        )
+    for name, count in stats.errors.items():
+        if name not in stats.latencies:
+            print(f"{name:<28}{'':>7}{count:>8}")
+
+    print("\nSocket.IO events received:")
+    for event, count in sorted(stats.events.items()):
+        print(f"  {event:<22}{count:>8}")
+
+    spreads = [
+        max(receipts) - min(receipts)
+        for receipts in stats.leaderboard_receipts.values()
+        if len(receipts) > 1
+    ]
+    print(f"\n{'fan-out delay':<35}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, values in (
+        ("answer -> host player_answered", stats.answer_delays),
+        ("leaderboard version spread", spreads),
+    ):
+        print(
+            f"  {label:<33}"
+            + "".join(
+                f"{percentile(values, pct) * 1000:>10.1f}" for pct in (50, 95, 99)
+            )
+        )
+
+
+async def start_in_memory_server():
+    """Start the app in-process on a free port with in-memory services"""
+    import uvicorn
+    import main
+    from benchmarks import stand_ins
+
+    stand_ins.install(main)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            main.socket_app, host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server, task
+
+
+async def run(args):
+    server = server_task = None
+    if args.in_memory:
+        args.url, server, server_task = await start_in_memory_server()
+
+    stats = LoadStats()
+    done = asyncio.Event()
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        host = asyncio.create_task(run_host(args, stats, done))
+        await asyncio.sleep(0.2)
+
+        stats.started = time.perf_counter()
+        await asyncio.gather(
+            *(run_player(index, args, http, stats) for index in range(args.players))
+        )
+        stats.finished = time.perf_counter()
+
+        done.set()
+        await host
+
+    report(args, stats)
+
+    if server is not None:
+        server.should_exit = True
+        await server_task
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=5, help="per player")
+    parser.add_argument("--think-min", type=float, default=1.0, help="seconds")
+    parser.add_argument("--think-max", type=float, default=5.0, help="seconds")
+    parser.add_argument(
+        "--ramp-up", type=float, default=5.0, help="seconds to spread joins over"
+    )
+    parser.add_argument(
+        "--linger", type=float, default=1.0, help="seconds to wait for broadcasts"
+    )
+    parser.add_argument(
+        "--connections", type=int, default=100, help="HTTP connection pool size"
+    )
+    parser.add_argument(
+        "--session",
+        default=f"load-{uuid.uuid4().hex[:8]}",
+        help="game session to play in (a fresh one by default)",
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="start the app in-process with in-memory MongoDB and Redis",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.in_memory:
+        logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""In-memory MongoDB and Redis stand-ins for running the backend locally.
+
+Uses mongomock-motor and fakeredis (see benchmarks/requirements.txt) so the
+load test can start the full app in-process without the compose services.
+Numbers measured this way show the app's own overhead, not database costs.
+"""
+
+import math
+from types import SimpleNamespace
+import mongomock.aggregate
+from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection
+import fakeredis
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+DB_NAME = "docker_quiz_game"
+
+
+def _patch_mongomock():
+    """Fill in the operations the backend uses that mongomock lacks"""
+    parser = mongomock.aggregate._Parser
+    handle_arithmetic = parser._handle_arithmetic_operator
+
+    def handle_arithmetic_with_round(self, operator, values):
+        if operator != "$round":
+            return handle_arithmetic(self, operator, values)
+        number, places = (list(self.parse_many(values)) + [0])[:2]
+        if number is None:
+            return None
+        factor = 10**places
+        return math.floor(number * factor + 0.5) / factor
+
+    mongomock.aggregate.arithmetic_operators.add("$round")
+    parser._handle_arithmetic_operator = handle_arithmetic_with_round
+
+    # mongomock's bulk_write predates pymongo 4.9's operation signatures
+    async def bulk_write(self, requests, ordered=True, **kwargs):
+        counts = {"nInserted": 0, "nUpserted": 0, "nModified": 0}
+        write_errors = []
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    await self.insert_one(dict(request._doc))
+                    counts["nInserted"] += 1
+                    continue
+                if isinstance(request, ReplaceOne):
+                    result = await self.replace_one(
+                        request._filter, request._doc, upsert=request._upsert
+                    )
+                else:
+                    result = await self.update_one(
+                        request._filter, request._doc, upsert=bool(request._upsert)
+                    )
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+                continue
+            counts["nModified"] += result.modified_count
+            counts["nUpserted"] += int(result.upserted_id is not None)
+        if write_errors:
+            raise BulkWriteError({**counts, "writeErrors": write_errors})
+        return SimpleNamespace(bulk_api_result=counts)
+
+    AsyncMongoMockCollection.bulk_write = bulk_write
+
+
+def install(main_module):
+    """Point an imported `main` module at in-memory MongoDB and Redis"""
+    from app.core import cache
+    from app.database.connection import db
+
+    _patch_mongomock()
+    redis_server = fakeredis.FakeServer()
+
+    async def connect_to_mongo():
+        db.client = AsyncMongoMockClient()
+        db.database = db.client[DB_NAME]
+
+    async def close_mongo_connection():
+        db.client = None
+
+    def redis_from_url(url, **kwargs):
+        return fakeredis.FakeAsyncRedis(
+            server=redis_server, decode_responses=kwargs.get("decode_responses", False)
+        )
+
+    main_module.connect_to_mongo = connect_to_mongo
+    main_module.close_mongo_connection = close_mongo_connection
+    cache.InstrumentedRedis.from_url = staticmethod(redis_from_url)
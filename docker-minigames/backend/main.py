@@ -5,10 +5,23 @@ import logging
 from contextlib import asynccontextmanager
 from app.routers import game, questions, leaderboard, admin
 from app.core.websocket_manager import WebSocketManager
-from app.database.connection import connect_to_mongo, close_mongo_connection
+from app.core.socket_codecs import SocketJson, get_socketio_serializer
+from app.database.connection import (
+    connect_to_mongo,
+    close_mongo_connection,
+    ensure_indexes,
+)
 from app.core.cache import cache_service
+from app.services.question_catalog import question_catalog
+from app.services.question_service import question_service
+from app.services.leaderboard_service import leaderboard_service
+from app.services.answer_log_service import answer_log_service
+from app.services.game_session_service import game_session_service
 from app.core.config import settings
+from app.core.observability import RequestMetricsMiddleware, get_metrics
+import asyncio
 import os
+import time
 
 # Configure logging
 logging.basicConfig(
@@ -17,11 +30,98 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create Socket.IO server
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+# Share Socket.IO emits across workers/hosts through Redis when enabled
+client_manager = None
+if settings.SOCKETIO_REDIS_ENABLED:
+    client_manager = socketio.AsyncRedisManager(
+        settings.redis_connection_string, channel=settings.SOCKETIO_REDIS_CHANNEL
+    )
+
+# Create Socket.IO server; packets are encoded with the fast codecs in
+# socket_codecs, once per broadcast
+sio = socketio.AsyncServer(
+    async_mode="asgi",
+    cors_allowed_origins="*",
+    client_manager=client_manager,
+    json=SocketJson,
+    serializer=get_socketio_serializer(settings.SOCKETIO_SERIALIZER),
+)
 
 # Initialize WebSocket manager
-websocket_manager = WebSocketManager(sio)
+websocket_manager = WebSocketManager(
+    sio,
+    leaderboard_loader=game.get_leaderboard_payload,
+    shared=settings.SOCKETIO_REDIS_ENABLED,
+    answer_handler=game.process_answer,
+    session_engine=game_session_service,
+)
+game_session_service.set_websocket_manager(websocket_manager)
+
+
+async def run_phase(timings: dict, name: str, *steps):
+    """Run a startup phase's steps concurrently and record its duration"""
+    started = time.perf_counter()
+    await asyncio.gather(*steps)
+    timings[name] = time.perf_counter() - started
+
+
+async def warm_redis_state():
+    if not cache_service.is_connected:
+        logger.info("⚠️ Redis cache not available - continuing without caching")
+        return
+
+    # Seed the sorted-set leaderboard if Redis was empty
+    await leaderboard_service.rebuild_if_empty()
+
+
+async def ensure_schema():
+    # Existing questions need their normalized key before the unique
+    # index on it can be built
+    await question_service.backfill_question_keys()
+    await ensure_indexes()
+
+
+async def run_startup_pipeline():
+    """Connect, prepare and warm everything before the app reports ready"""
+    timings = {}
+    started = time.perf_counter()
+
+    # Catalog follows admin writes made on other workers
+    cache_service.add_invalidation_callback(question_catalog.on_cache_invalidation)
+
+    # MongoDB and Redis are independent; a Redis failure only disables caching
+    await run_phase(timings, "connect", connect_to_mongo(), cache_service.connect())
+    logger.info("✅ MongoDB connection established!")
+
+    await run_phase(timings, "indexes", ensure_schema())
+    await run_phase(timings, "seed", question_service.seed_questions())
+
+    # Answer keys for the /api/answer hot path, cached counts and the
+    # sorted-set leaderboard
+    await run_phase(
+        timings,
+        "warm",
+        question_catalog.load(),
+        question_service.get_question_count(),
+        warm_redis_state(),
+    )
+
+    # Resume game sessions whose worker went away and serve session actions
+    # forwarded by other workers; rounds are served from the catalog, so
+    # this runs after it is loaded
+    if cache_service.is_connected:
+        await run_phase(timings, "sessions", game_session_service.restore())
+        game_session_service.start_worker()
+
+    # Start batched write-behind for the answer event log
+    answer_log_service.start()
+
+    breakdown = ", ".join(
+        f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()
+    )
+    logger.info(
+        f"⏱️ Startup took {(time.perf_counter() - started) * 1000:.0f}ms ({breakdown})"
+    )
 
 
 # Lifespan event handler
@@ -36,23 +136,16 @@ async def lifespan(app: FastAPI):
     environment = os.getenv("ENVIRONMENT", "development")
 
     logger.info(f"🌍 Environment: {environment}")
+    logger.info(
+        f"🔌 Socket.IO mode: {'Redis shared' if client_manager else 'single process'}"
+    )
     logger.info(f"🗄️ Database Name: {db_name}")
     logger.info(
         f"🔗 MongoDB Type: {'Atlas' if 'mongodb.net' in mongodb_url else 'Local/Remote'}"
     )
 
     try:
-        # Connect to MongoDB
-        await connect_to_mongo()
-        logger.info("✅ MongoDB connection established!")
-
-        # Connect to Redis
-        await cache_service.connect()
-        if cache_service.is_connected:
-            logger.info("✅ Redis cache connection established!")
-        else:
-            logger.info("⚠️ Redis cache not available - continuing without caching")
-
+        await run_startup_pipeline()
         logger.info("✅ Server ready!")
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
@@ -66,6 +159,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down...")
     try:
+        await game_session_service.stop()
+        await websocket_manager.close()
+        await answer_log_service.stop()
         await close_mongo_connection()
         await cache_service.disconnect()
         logger.info("✅ Shutdown complete!")
@@ -90,6 +186,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts and latency per route template
+app.add_middleware(RequestMetricsMiddleware)
+
+
 # Inject WebSocket manager into game router
 game.set_websocket_manager(websocket_manager)
 
@@ -111,6 +211,12 @@ async def root():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return get_metrics()
+
+
 @app.get("/health")
 async def health():
     return {
@@ -118,6 +224,10 @@ async def health():
         "service": "docker-quiz-api",
         "database": "connected" if hasattr(app.state, "db") else "unknown",
         "cache": "connected" if cache_service.is_connected else "disconnected",
+        "websocket": websocket_manager.get_stats(),
+        "answer_log": answer_log_service.get_stats(),
+        "game_sessions": game_session_service.get_stats(),
+        "cache_tiers": cache_service.get_stats(),
     }
 
 
@@ -127,4 +237,12 @@ socket_app = socketio.ASGIApp(sio, app)
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("main:socket_app", host="0.0.0.0", port=8000, reload=True)
+    # Reload only works with a single worker
+    workers = settings.UVICORN_WORKERS
+    uvicorn.run(
+        "main:socket_app",
+        host="0.0.0.0",
+        port=8000,
+        reload=workers == 1,
+        workers=workers,
+    )
@@ -10,7 +10,7 @@ import {
   Container,
 } from "@mui/material";
 import { PlayArrow, Person } from "@mui/icons-material";
-import { useGame } from "../../contexts/GameContext";
+import { useGame, getSessionId } from "../../contexts/GameContext";
 import { gameApi } from "../../services/api";
 
 const JoinScreen: React.FC = () => {
@@ -37,7 +37,10 @@ const JoinScreen: React.FC = () => {
     setError("");
 
     try {
-      const player = await gameApi.joinGame({ name: playerName.trim() });
+      const player = await gameApi.joinGame({
+        name: playerName.trim(),
+        session_id: getSessionId(),
+      });
       dispatch({ type: "SET_PLAYER", payload: player });
       dispatch({ type: "SET_GAME_STATUS", payload: "playing" });
       navigate("/quiz");
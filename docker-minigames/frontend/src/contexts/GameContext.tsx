@@ -1,4 +1,10 @@
-import React, { createContext, useContext, useReducer, useEffect } from "react";
+import React, {
+  createContext,
+  useContext,
+  useReducer,
+  useEffect,
+  useRef,
+} from "react";
 import { useSocket } from "./SocketContext";
 
 export interface Player {
@@ -6,6 +12,7 @@ export interface Player {
   name: string;
   score: number;
   joined_at?: string; // Added: Match backend response
+  session_id?: string;
 }
 
 export interface Question {
@@ -148,6 +155,52 @@ const gameReducer = (state: GameState, action: GameAction): GameState => {
   }
 };
 
+// Versioned leaderboard protocol: full snapshots or deltas against a version.
+// Versions are only comparable within one epoch; the server restarts them
+// in a new epoch after a restart or once the session went idle.
+interface LeaderboardEntry extends Player {
+  rank: number;
+}
+
+interface LeaderboardPayload {
+  type?: "snapshot" | "delta";
+  version?: number;
+  epoch?: string | null;
+  base_version?: number;
+  leaderboard?: LeaderboardEntry[];
+  updated?: { id: string; rank: number; score: number }[];
+  added?: LeaderboardEntry[];
+  removed?: string[];
+}
+
+const applyLeaderboardDelta = (
+  entries: LeaderboardEntry[],
+  delta: LeaderboardPayload
+): LeaderboardEntry[] => {
+  const removed = new Set(delta.removed ?? []);
+  const byId = new Map(
+    entries.filter((e) => !removed.has(e.id)).map((e) => [e.id, e])
+  );
+  for (const change of delta.updated ?? []) {
+    const entry = byId.get(change.id);
+    if (entry) {
+      byId.set(change.id, {
+        ...entry,
+        rank: change.rank,
+        score: change.score,
+      });
+    }
+  }
+  for (const entry of delta.added ?? []) {
+    byId.set(entry.id, entry);
+  }
+  return [...byId.values()].sort((a, b) => a.rank - b.rank);
+};
+
+// Game session from the `?session=` URL parameter; "public" by default
+export const getSessionId = (): string =>
+  new URLSearchParams(window.location.search).get("session") || "public";
+
 interface GameContextType {
   state: GameState;
   dispatch: React.Dispatch<GameAction>;
@@ -170,10 +223,92 @@ interface GameProviderProps {
 export const GameProvider: React.FC<GameProviderProps> = ({ children }) => {
   const [state, dispatch] = useReducer(gameReducer, initialState);
   const { socket } = useSocket();
+  const leaderboardRef = useRef<{
+    version: number | null;
+    epoch: string | null;
+    entries: LeaderboardEntry[];
+  }>({ version: null, epoch: null, entries: [] });
+  const sessionId = state.currentPlayer?.session_id ?? getSessionId();
+  const playerId = state.currentPlayer?.id;
 
   useEffect(() => {
     if (!socket) return;
 
+    // Versions are per session
+    leaderboardRef.current = { version: null, epoch: null, entries: [] };
+
+    const publishLeaderboard = (
+      entries: LeaderboardEntry[],
+      version: number | null,
+      epoch: string | null
+    ) => {
+      leaderboardRef.current = { version, epoch, entries };
+      // Convert joined_at strings back to Date objects if needed
+      const processedLeaderboard = entries.map((player: any) => ({
+        ...player,
+        joined_at: player.joined_at ? new Date(player.joined_at) : undefined,
+      }));
+      dispatch({ type: "UPDATE_LEADERBOARD", payload: processedLeaderboard });
+    };
+
+    const applyLeaderboardPayload = (data: LeaderboardPayload): boolean => {
+      if (data.type === "delta") {
+        if (
+          data.epoch !== leaderboardRef.current.epoch ||
+          data.base_version !== leaderboardRef.current.version
+        ) {
+          return false;
+        }
+        publishLeaderboard(
+          applyLeaderboardDelta(leaderboardRef.current.entries, data),
+          data.version ?? null,
+          data.epoch ?? null
+        );
+        return true;
+      }
+      if (data.leaderboard && Array.isArray(data.leaderboard)) {
+        publishLeaderboard(
+          data.leaderboard,
+          data.version ?? null,
+          data.epoch ?? null
+        );
+      }
+      return true;
+    };
+
+    const syncLeaderboard = () => {
+      socket.emit(
+        "leaderboard_sync",
+        {
+          version: leaderboardRef.current.version,
+          epoch: leaderboardRef.current.epoch,
+        },
+        (data: LeaderboardPayload) => {
+          if (data) applyLeaderboardPayload(data);
+        }
+      );
+    };
+
+    // Broadcasts are scoped to the session's room; joining also acks with
+    // the session's leaderboard
+    const joinSession = () => {
+      socket.emit(
+        "join_session",
+        {
+          session_id: sessionId,
+          player_id: playerId,
+          version: leaderboardRef.current.version,
+          epoch: leaderboardRef.current.epoch,
+        },
+        (data: LeaderboardPayload) => {
+          if (data) applyLeaderboardPayload(data);
+        }
+      );
+    };
+
+    socket.on("connect", joinSession);
+    if (socket.connected) joinSession();
+
     socket.on("player_joined", (data: any) => {
       console.log("Player joined event:", data);
       const player: Player = {
@@ -184,15 +319,11 @@ export const GameProvider: React.FC<GameProviderProps> = ({ children }) => {
       dispatch({ type: "PLAYER_JOINED", payload: player });
     });
 
-    socket.on("leaderboard_updated", (data: any) => {
+    socket.on("leaderboard_updated", (data: LeaderboardPayload) => {
       console.log("Leaderboard updated event:", data);
-      if (data.leaderboard && Array.isArray(data.leaderboard)) {
-        // Convert joined_at strings back to Date objects if needed
-        const processedLeaderboard = data.leaderboard.map((player: any) => ({
-          ...player,
-          joined_at: player.joined_at ? new Date(player.joined_at) : undefined,
-        }));
-        dispatch({ type: "UPDATE_LEADERBOARD", payload: processedLeaderboard });
+      // A delta against a version we don't hold means we missed an update
+      if (!applyLeaderboardPayload(data)) {
+        syncLeaderboard();
       }
     });
 
@@ -222,11 +353,12 @@ export const GameProvider: React.FC<GameProviderProps> = ({ children }) => {
     });
 
     return () => {
+      socket.off("connect", joinSession);
       socket.off("player_joined");
       socket.off("leaderboard_updated");
       socket.off("player_answered");
     };
-  }, [socket]);
+  }, [socket, sessionId, playerId]);
 
   return (
     <GameContext.Provider value={{ state, dispatch }}>
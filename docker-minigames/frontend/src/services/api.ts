@@ -42,6 +42,7 @@ const api = axios.create({
 
 export interface JoinGameRequest {
   name: string;
+  session_id?: string;
 }
 
 export interface SubmitAnswerRequest {